@@ -0,0 +1,198 @@
+"""
+Benchmark do pipeline do build.py sobre um catálogo sintético (benchmarks/gerar_catalogo.py).
+
+Mede, com o TMDB desligado (tmdb_get levanta erro; nada sai para a rede):
+- parse_m3u                          todos os .m3u do input/ sintético
+- process_multi_m3u                  uma chamada por série/novela
+- get_poster_path_direct             todos os títulos, índice de capas recém-criado
+- normalize_tv_group                 o group de todos os canais do channels.json
+- generate_m3u_with_grouping         vod_grouped.m3u do catálogo inteiro
+- generate_epg                       epg.xml do catálogo inteiro
+- generate_html_with_correct_paths   channels-dict.js + arquivos PWA
+
+Os geradores de arquivo rodam com a pasta de saída limpa a cada repetição
+(o write-if-changed não pode pular a gravação). O resultado vai em JSON
+(--out, padrão cache/bench_build.json, ignorado pelo git) para comparar entre
+commits (--compare).
+
+Uso:
+    python benchmarks/bench_build.py [--series 200] [--temporadas 3] [--episodios 24]
+                                     [--filmes 500] [--canais 20000] [--repeat 3]
+                                     [--out cache/bench_build.json] [--compare antigo.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import build  # noqa: E402
+from utils import Channel, normalize_tv_group  # noqa: E402
+from gerar_catalogo import gerar_catalogo  # noqa: E402
+
+
+def _sem_tmdb(*args, **kwargs):
+    raise RuntimeError("TMDB desligado no benchmark")
+
+
+def medir(func, repeat, setup=None):
+    """Roda func repeat vezes (com setup() antes de cada uma, fora do tempo), sem stdout."""
+    tempos = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            func()
+            tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def montar_catalogo(base):
+    """data.json em memória a partir da árvore sintética, como o build faria (sem TMDB)."""
+    output = {cat_id: [] for cat_id in build.VOD_CATEGORIES}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for cat_folder in ("Filmes", "Series", "Novelas"):
+            cat_path = base / "input" / cat_folder
+            cat_id = cat_folder.lower()
+            for unit in build._collect_units(cat_path, cat_folder, cat_id):
+                output[cat_id].extend(build._process_unit(unit, cat_folder, cat_id))
+    canais = json.loads((base / "web" / "channels.json").read_text(encoding="utf-8"))
+    output["tv"] = [Channel.from_dict(c) for c in canais]
+    return output
+
+
+def executar(base, repeat):
+    build._POSTER_INDEX = build.PosterIndex(base)
+    data = montar_catalogo(base)
+    m3u_files = sorted((base / "input").rglob("*.m3u"))
+    series = [(pasta.name, sorted(pasta.glob("*.m3u"))) for pasta in (base / "input" / "Series").iterdir()]
+    titulos = [(item["title"], cat) for cat in build.VOD_CATEGORIES for item in data.get(cat, [])]
+    grupos = [canal.get("group", "") for canal in data["tv"]]
+    saida = base / "iptv_playlists"
+
+    def limpar_saida():
+        shutil.rmtree(saida, ignore_errors=True)
+        saida.mkdir()
+
+    def limpar_web():
+        for nome in ("channels-dict.js", "manifest.json", "sw.js", "icons"):
+            alvo = base / "web" / nome
+            if alvo.is_dir():
+                shutil.rmtree(alvo)
+            else:
+                alvo.unlink(missing_ok=True)
+
+    def novo_indice():
+        build._POSTER_INDEX = build.PosterIndex(base)
+
+    n_episodios = sum(len(s["episodes"]) for item in data["series"] for s in item["seasons"])
+    casos = {
+        "parse_m3u": (lambda: [build.parse_m3u(f) for f in m3u_files], None, len(m3u_files)),
+        "process_multi_m3u": (lambda: [build.process_multi_m3u(nome, arquivos, [], "Series", "series")
+                                       for nome, arquivos in series], None, len(series)),
+        "get_poster_path_direct": (lambda: [build.get_poster_path_direct(t, c) for t, c in titulos],
+                                   novo_indice, len(titulos)),
+        "normalize_tv_group": (lambda: [normalize_tv_group(g) for g in grupos], None, len(grupos)),
+        "generate_m3u_with_grouping": (lambda: build.generate_m3u_with_grouping(data, saida),
+                                       limpar_saida, n_episodios),
+        "generate_epg": (lambda: build.generate_epg(data, saida), limpar_saida, len(titulos)),
+        "generate_html_with_correct_paths": (lambda: build.generate_html_with_correct_paths(base, data),
+                                             limpar_web, len(data["tv"])),
+    }
+    resultados = {}
+    for nome, (func, setup, itens) in casos.items():
+        tempos = medir(func, repeat, setup)
+        resultados[nome] = {
+            "best_s":      round(min(tempos), 6),
+            "mean_s":      round(statistics.mean(tempos), 6),
+            "items":       itens,
+            "us_per_item": round(min(tempos) / max(itens, 1) * 1e6, 3),
+        }
+    return resultados
+
+
+def comparar(resultados, params, antigo_path):
+    antigo = json.loads(Path(antigo_path).read_text(encoding="utf-8"))
+    print(f"\n🔁 Comparação com {antigo_path} (commit {antigo.get('meta', {}).get('commit')}):")
+    if antigo.get("meta", {}).get("params") != params:
+        print("   ⚠️  Catálogos sintéticos diferentes — os tempos não são comparáveis")
+    for nome, r in resultados.items():
+        old = antigo.get("results", {}).get(nome)
+        if not old:
+            print(f"   {nome:<34} (sem referência)")
+            continue
+        razao = old["best_s"] / r["best_s"] if r["best_s"] else float("inf")
+        sinal = "🟢" if razao >= 1.05 else "🔴" if razao <= 0.95 else "⚪"
+        print(f"   {sinal} {nome:<34} {old['best_s'] * 1000:9.2f} ms → {r['best_s'] * 1000:9.2f} ms ({razao:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline do build.py")
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--temporadas", type=int, default=3)
+    parser.add_argument("--episodios", type=int, default=24)
+    parser.add_argument("--filmes", type=int, default=500)
+    parser.add_argument("--canais", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=Path, default=ROOT / "cache" / "bench_build.json",
+                        help="Arquivo JSON com os resultados")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    build.tmdb_get = _sem_tmdb
+    with tempfile.TemporaryDirectory(prefix="pirataflix-bench-") as tmp:
+        base = Path(tmp)
+        params = gerar_catalogo(base, args.series, args.temporadas, args.episodios,
+                                args.filmes, args.canais)
+        print(f"🏗️  Catálogo sintético: {params}")
+        resultados = executar(base, args.repeat)
+
+    print(f"\n📊 Melhor de {args.repeat}:")
+    for nome, r in resultados.items():
+        print(f"   {nome:<34} {r['best_s'] * 1000:9.2f} ms  "
+              f"({r['items']} itens, {r['us_per_item']:.2f} µs/item)")
+
+    relatorio = {
+        "meta": {
+            "commit":    _commit(),
+            "date":      datetime.now().isoformat(timespec="seconds"),
+            "python":    platform.python_version(),
+            "platform":  platform.platform(),
+            "repeat":    args.repeat,
+            "params":    params,
+        },
+        "results": resultados,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(relatorio, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n💾 Resultados em {args.out}")
+
+    if args.compare:
+        comparar(resultados, params, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Micro-benchmark do extrator de número de episódio/temporada.
+
+Compara o laço antigo (8 re.search + re.findall por título) com o
+extract_episode_numbers (uma regex compilada, em lote) sobre um corpus de
+títulos de capítulos de novela. Também confere que os dois dão o mesmo resultado.
+
+Uso:
+    python benchmarks/bench_episode_parse.py [--titles 50000] [--repeat 5] [--max-us 2.0]
+
+--max-us faz o script sair com erro se o custo por título do extrator novo
+passar do limite (para usar como trava em CI).
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from build import extract_episode_numbers, extract_season_number  # noqa: E402
+
+NOVELAS = [
+    "Mulheres Apaixonadas", "Avenida Brasil", "O Clone", "Senhora do Destino",
+    "Terra Nostra", "Laços de Família", "Amor à Vida", "Chocolate com Pimenta",
+    "A Favorita", "Renascer", "Pantanal", "Alma Gêmea",
+]
+EPISODE_TITLES = [
+    "{novela} - Capítulo {n}",
+    "Capítulo {n} - {novela}",
+    "Capitulo {n}",
+    "{novela} Cap. {n}",
+    "{novela} #{n}",
+    "{n} - {novela}",
+    "{novela} E{n:02d}",
+    "{novela} S01E{n:02d}",
+    "Episódio {n}",
+    "{novela} Ep. {n}",
+    "{n}",
+    "{novela} ({ano}) {n}",
+    "{novela} Final",
+]
+SEASON_FILES = ["{novela}_T{n}", "{novela}_Temporada{n}", "{novela}_S{n}", "{novela}_{n}", "{novela}"]
+
+
+def legacy_episode_number(title):
+    """Implementação anterior, mantida aqui só como referência."""
+    patterns = [
+        r'EP?\s*(\d+)',
+        r'Episódio\s*(\d+)',
+        r'Capítulo\s*(\d+)',
+        r'(\d+)\s*-\s*',
+        r'^\s*(\d+)\s*$',
+        r'E(\d+)',
+        r'Ep\.\s*(\d+)',
+        r'#(\d+)'
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, title, re.IGNORECASE)
+        if match:
+            try:
+                return int(match.group(1))
+            except:
+                continue
+    numbers = re.findall(r'\d+', title)
+    if numbers:
+        try:
+            return int(numbers[-1])
+        except:
+            pass
+    return None
+
+
+def legacy_season_number(filename):
+    for pattern in (r'(?:_T|_S|_Season|_Temporada)(\d+)', r'_(\d+)$'):
+        match = re.search(pattern, filename, re.IGNORECASE)
+        if match:
+            return int(match.group(1))
+    return 1
+
+
+def build_corpus(size, seed=42):
+    """Títulos sintéticos + os #EXTINF reais de input/ (se existir)."""
+    rnd = random.Random(seed)
+    titles = []
+    for path in sorted((ROOT / "input").rglob("*.m3u")):
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            titles += [line.split(",", 1)[-1].strip() for line in f if line.startswith("#EXTINF")]
+    while len(titles) < size:
+        titles.append(rnd.choice(EPISODE_TITLES).format(
+            novela=rnd.choice(NOVELAS), n=rnd.randint(1, 250), ano=rnd.randint(1990, 2024)))
+    seasons = [rnd.choice(SEASON_FILES).format(novela=rnd.choice(NOVELAS).replace(" ", "_"),
+                                               n=rnd.randint(1, 12))
+               for _ in range(max(1, size // 10))]
+    return titles[:size], seasons
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do extrator de episódios")
+    parser.add_argument("--titles", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-us", type=float, default=None,
+                        help="Falha se o extrator novo passar de N µs por título")
+    args = parser.parse_args()
+
+    titles, seasons = build_corpus(args.titles)
+
+    if [legacy_episode_number(t) for t in titles] != extract_episode_numbers(titles):
+        print("❌ Resultados diferentes entre o extrator antigo e o novo")
+        return 1
+    if [legacy_season_number(s) for s in seasons] != [extract_season_number(s) for s in seasons]:
+        print("❌ Temporadas diferentes entre o extrator antigo e o novo")
+        return 1
+
+    old = best_of(lambda: [legacy_episode_number(t) for t in titles], args.repeat)
+    new = best_of(lambda: extract_episode_numbers(titles), args.repeat)
+    old_s = best_of(lambda: [legacy_season_number(s) for s in seasons], args.repeat)
+    new_s = best_of(lambda: [extract_season_number(s) for s in seasons], args.repeat)
+
+    per_title = new / len(titles) * 1e6
+    print(f"📊 {len(titles)} títulos, {len(seasons)} nomes de temporada (melhor de {args.repeat})")
+    print(f"   Episódio  antigo: {old / len(titles) * 1e6:6.2f} µs/título")
+    print(f"   Episódio  novo:   {per_title:6.2f} µs/título  ({old / new:.1f}x)")
+    print(f"   Temporada antigo: {old_s / len(seasons) * 1e6:6.2f} µs/nome")
+    print(f"   Temporada novo:   {new_s / len(seasons) * 1e6:6.2f} µs/nome  ({old_s / new_s:.1f}x)")
+
+    if args.max_us is not None and per_title > args.max_us:
+        print(f"❌ {per_title:.2f} µs/título acima do limite de {args.max_us} µs")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
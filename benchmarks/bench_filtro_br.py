@@ -0,0 +1,112 @@
+"""
+Benchmark do filtrar_brasileiros sobre uma playlist sintética de 100k canais.
+
+Compara:
+- antigo:  any(x in texto) sobre KW_EXCL e KW_BR (~75 buscas por canal)
+- lookahead: uma única regex (?=(?P<excl>...)|(?P<br>...)) percorrida com finditer
+- atual:   download_iptv.filtrar_brasileiros (duas regex com prefixos fatorados)
+
+Todos precisam devolver a mesma lista de canais.
+
+Uso:
+    python benchmarks/bench_filtro_br.py [--canais 100000] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+with contextlib.redirect_stdout(io.StringIO()):   # download_iptv imprime um cabeçalho ao importar
+    from download_iptv import KW_BR, KW_EXCL, _regex_trie, filtrar_brasileiros, parse_m3u
+
+NOMES = [
+    "Globo SP", "SBT HD", "Record News", "Band Sports", "TV Cultura", "CNN Brasil",
+    "ESPN 2", "HBO Max ", "Discovery Kids", "Canção Nova", "TV Senado", "Megapix",
+    "Fox News USA ", "BBC One UK ", "Das Erste Deutsch", "France 24", "Rai Italia",
+    "Telemundo Mexico ", "TN Argentina ", "Caracol Colombia", "TRT Turkish", "Al Jazeera Arabic",
+    "Zee Hindi", "CCTV Chinese", "Weather Channel", "Local 7", "Music Box", "Pluto TV Cine",
+]
+GRUPOS = ["News", "Sports", "Movies", "Kids", "Undefined", "Entertainment", "Religious", "Music"]
+PAISES = ["br", "us", "uk", "de", "fr", "it", "mx", "ar", "co", "tr", "in", "cn"]
+
+
+def playlist_sintetica(total, seed=7):
+    rnd = random.Random(seed)
+    linhas = ["#EXTM3U"]
+    for i in range(total):
+        nome = f"{rnd.choice(NOMES)} {rnd.choice(['', 'HD', 'SD', 'FHD', '(1080p)'])}".strip()
+        tvg_id = f"{re.sub(r'[^A-Za-z0-9]', '', nome)}{i}.{rnd.choice(PAISES)}@SD"
+        linhas.append(f'#EXTINF:-1 tvg-id="{tvg_id}" tvg-logo="https://logo/{i}.png" '
+                      f'group-title="{rnd.choice(GRUPOS)}",{nome}')
+        linhas.append(f"https://cdn{i % 50}.example/{i}/index.m3u8")
+    return "\n".join(linhas) + "\n"
+
+
+def filtro_antigo(canais):
+    resultado = []
+    for c in canais:
+        texto = f"{c['title']} {c['tvg_id']} {c['group_raw']}".lower()
+        if any(x in texto for x in KW_EXCL):
+            continue
+        if any(x in texto for x in KW_BR) or '.br' in c['tvg_id'].lower():
+            resultado.append(c)
+    return resultado
+
+
+_LOOKAHEAD = re.compile(f"(?=(?P<excl>{_regex_trie(KW_EXCL)})|(?P<br>{_regex_trie(KW_BR)}))")
+
+def filtro_lookahead(canais):
+    resultado = []
+    for c in canais:
+        texto = f"{c['title']} {c['tvg_id']} {c['group_raw']}".lower()
+        excluido = br = False
+        for m in _LOOKAHEAD.finditer(texto):
+            if m.lastgroup == 'excl':
+                excluido = True
+                break
+            br = True
+        if not excluido and (br or '.br' in c['tvg_id'].lower()):
+            resultado.append(c)
+    return resultado
+
+
+def best_of(func, arg, repeat):
+    melhor, resultado = float("inf"), None
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        resultado = func(arg)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do filtro de canais brasileiros")
+    parser.add_argument("--canais", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    canais = parse_m3u(io.StringIO(playlist_sintetica(args.canais)))
+    print(f"📊 {len(canais)} canais sintéticos (parse em {time.perf_counter() - inicio:.2f}s), melhor de {args.repeat}")
+
+    t_antigo, ref = best_of(filtro_antigo, canais, args.repeat)
+    print(f"   {'antigo (any/in):':<21}{t_antigo:.3f}s  {len(ref)} canais")
+    for nome, func in (("lookahead (1 regex)", filtro_lookahead), ("atual (2 regex)", filtrar_brasileiros)):
+        tempo, res = best_of(func, canais, args.repeat)
+        if res != ref:
+            print(f"❌ {nome}: resultado diferente do filtro antigo")
+            return 1
+        print(f"   {nome + ':':<21}{tempo:.3f}s  ({t_antigo / tempo:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Pico de memória (RSS) do catálogo em memória: registros com __slots__ x dicts.
+
+Gera um catálogo sintético grande (benchmarks/gerar_catalogo.py) e, para cada
+modo, roda um processo filho que monta o catálogo como o build.py faz e mede
+o ru_maxrss acima do que o processo já usava depois dos imports:
+
+- records: como o build faz hoje (Title/Season/Episode/Channel de utils)
+- dicts:   os mesmos dados convertidos para dicts aninhados, um título por vez
+           (equivale ao pipeline antigo; listas compartilhadas continuam compartilhadas)
+
+Também mede o tempo de serializar o catálogo com dumps_json, já que os
+registros passam pelo default= do json.
+
+Uso:
+    python benchmarks/bench_memoria.py [--series 400] [--temporadas 4] [--episodios 60]
+                                       [--filmes 1000] [--canais 50000]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def _plain(obj, memo):
+    """Cópia em dicts/listas comuns, preservando listas compartilhadas (ex: episodes)."""
+    if isinstance(obj, list):
+        if id(obj) not in memo:
+            memo[id(obj)] = [_plain(x, memo) for x in obj]
+        return memo[id(obj)]
+    if hasattr(obj, 'to_dict'):
+        return {k: _plain(v, memo) for k, v in obj.to_dict().items()}
+    return obj
+
+
+def _n_episodios(item):
+    if item.get("seasons"):
+        return sum(len(s["episodes"]) for s in item["seasons"])
+    return len(item.get("episodes") or [])
+
+
+def _maxrss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def filho(base, modo):
+    """Roda no processo filho: monta o catálogo e imprime as medidas em JSON."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import build
+        from utils import Channel, dumps_json
+    gc.collect()
+    inicial = _maxrss_kb()
+
+    build._POSTER_INDEX = build.PosterIndex(base)
+    output = {cat_id: [] for cat_id in build.VOD_CATEGORIES}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for cat_folder in ("Filmes", "Series", "Novelas"):
+            cat_id = cat_folder.lower()
+            for unit in build._collect_units(base / "input" / cat_folder, cat_folder, cat_id):
+                records = build._process_unit(unit, cat_folder, cat_id)
+                if modo == "dicts":
+                    records = [_plain(r, {}) for r in records]
+                output[cat_id].extend(records)
+    canais = json.loads((base / "web" / "channels.json").read_text(encoding="utf-8"))
+    output["tv"] = canais if modo == "dicts" else [Channel.from_dict(c) for c in canais]
+    del canais
+    gc.collect()
+    montado = _maxrss_kb()
+
+    inicio = time.perf_counter()
+    texto = dumps_json(output)
+    serializar = time.perf_counter() - inicio
+    print(json.dumps({
+        "modo":         modo,
+        "pico_mb":      round((montado - inicial) / 1024, 1),
+        "serializar_s": round(serializar, 3),
+        "json_mb":      round(len(texto.encode("utf-8")) / 1024 / 1024, 1),
+        "episodios":    sum(_n_episodios(i) for c in build.VOD_CATEGORIES for i in output[c]),
+        "canais":       len(output["tv"]),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pico de RSS: registros com __slots__ x dicts")
+    parser.add_argument("--series", type=int, default=400)
+    parser.add_argument("--temporadas", type=int, default=4)
+    parser.add_argument("--episodios", type=int, default=60)
+    parser.add_argument("--filmes", type=int, default=1000)
+    parser.add_argument("--canais", type=int, default=50000)
+    parser.add_argument("--filho", nargs=2, metavar=("BASE", "MODO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        filho(Path(args.filho[0]), args.filho[1])
+        return 0
+
+    from gerar_catalogo import gerar_catalogo
+    with tempfile.TemporaryDirectory(prefix="pirataflix-mem-") as tmp:
+        params = gerar_catalogo(tmp, args.series, args.temporadas, args.episodios,
+                                args.filmes, args.canais)
+        print(f"🏗️  Catálogo sintético: {params}")
+        medidas = {}
+        for modo in ("dicts", "records"):
+            saida = subprocess.run([sys.executable, __file__, "--filho", tmp, modo],
+                                   capture_output=True, text=True, check=True).stdout
+            medidas[modo] = json.loads(saida.strip().splitlines()[-1])
+
+    for modo, m in medidas.items():
+        print(f"   {modo:<8} pico +{m['pico_mb']:7.1f} MB | dumps_json {m['serializar_s']:.2f}s "
+              f"({m['json_mb']} MB, {m['episodios']} episódios, {m['canais']} canais)")
+    antes, depois = medidas["dicts"]["pico_mb"], medidas["records"]["pico_mb"]
+    print(f"📉 Redução do pico: {antes - depois:.1f} MB ({100 - depois * 100 / max(antes, 0.1):.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Gerador de catálogos sintéticos para os benchmarks.
+
+Monta uma árvore com a mesma forma da real:
+- input/Series/<Série>/<Série>_T<n>.m3u   (N séries × M temporadas × K episódios)
+- input/Novelas/<Novela>_T<n>.m3u          (temporadas soltas na raiz da categoria)
+- input/Filmes/<Filme>.m3u
+- assets/Capas/*.jpg                      (capas exatas, aproximadas e faltando)
+- web/channels.json                       (canais de TV com grupos variados)
+
+Uso:
+    python benchmarks/gerar_catalogo.py DESTINO [--series 200] [--temporadas 3] [--episodios 24]
+                                                [--filmes 500] [--canais 20000]
+"""
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from build import slugify  # noqa: E402
+
+PALAVRAS = [
+    "Amor", "Destino", "Terra", "Sol", "Noite", "Cidade", "Segredo", "Família", "Guerra",
+    "Mar", "Coração", "Império", "Caminho", "Fogo", "Sombra", "Verão", "Pantanal", "Rio",
+    "Estrela", "Vingança", "Herança", "Paixão", "Fronteira", "Lua", "Jogo", "Reino",
+]
+EPISODIOS = [
+    "{serie} - Temporada {t} Episódio {n}",
+    "{serie} S{t:02d}E{n:02d}",
+    "{serie} - Capítulo {n}",
+    "Episódio {n}",
+    "{serie} Ep. {n}",
+    "{n} - {serie}",
+]
+GRUPOS_TV = [
+    "News", "Sports", "Movies", "Kids", "Undefined", "Entertainment", "Religious", "Music",
+    "Animation;Kids", "Documentary", "Series", "Shop", "Legislative", "Culture", "Comedy", "",
+]
+
+
+def _titulo(rnd, usados):
+    while True:
+        nome = " ".join(rnd.sample(PALAVRAS, rnd.randint(1, 3)))
+        if rnd.random() < 0.3:
+            nome += f" {rnd.randint(2, 99)}"
+        if nome not in usados:
+            usados.add(nome)
+            return nome
+
+
+def _escrever_m3u(path, rnd, serie, temporada, episodios):
+    linhas = ["#EXTM3U"]
+    modelo = rnd.choice(EPISODIOS)
+    slug = slugify(serie)
+    for n in range(1, episodios + 1):
+        linhas.append(f'#EXTINF:-1 tvg-logo="https://img.example/{slug}.jpg",'
+                      + modelo.format(serie=serie, t=temporada, n=n))
+        linhas.append(f"https://cdn{n % 7}.example/{slug}/{temporada}x{n:03d}.mp4")
+    path.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+
+
+def _capa(capas, rnd, titulo):
+    """~60% com capa exata, ~20% com nome aproximado (fuzzy), o resto sem capa."""
+    sorte = rnd.random()
+    if sorte < 0.6:
+        (capas / f"{slugify(titulo)}.jpg").touch()
+    elif sorte < 0.8:
+        (capas / f"{slugify(titulo)}_poster_hd.jpg").touch()
+
+
+def gerar_catalogo(destino, series=200, temporadas=3, episodios=24, filmes=500, canais=20000,
+                   seed=42):
+    """Cria a árvore sintética em destino e devolve um resumo com as quantidades."""
+    rnd = random.Random(seed)
+    destino = Path(destino)
+    capas = destino / "assets" / "Capas"
+    web = destino / "web"
+    for pasta in (capas, web, destino / "input" / "Series", destino / "input" / "Novelas",
+                  destino / "input" / "Filmes"):
+        pasta.mkdir(parents=True, exist_ok=True)
+    (capas / "default.jpg").touch()
+
+    usados = set()
+    for i in range(series):
+        titulo = _titulo(rnd, usados)
+        _capa(capas, rnd, titulo)
+        if i % 4 == 3:
+            # Uma em cada quatro fica solta na raiz de Novelas, um .m3u por temporada
+            for t in range(1, temporadas + 1):
+                _escrever_m3u(destino / "input" / "Novelas" / f"{titulo.replace(' ', '_')}_T{t}.m3u",
+                              rnd, titulo, t, episodios)
+            continue
+        pasta = destino / "input" / "Series" / titulo
+        pasta.mkdir(exist_ok=True)
+        for t in range(1, temporadas + 1):
+            _escrever_m3u(pasta / f"{titulo.replace(' ', '_')}_T{t}.m3u", rnd, titulo, t, episodios)
+
+    for _ in range(filmes):
+        titulo = _titulo(rnd, usados)
+        _capa(capas, rnd, titulo)
+        slug = slugify(titulo)
+        (destino / "input" / "Filmes" / f"{titulo.replace(' ', '_')}.m3u").write_text(
+            f"#EXTM3U\n#EXTINF:-1,{titulo}\nhttps://vod.example/{slug}.mp4\n", encoding="utf-8")
+
+    lista = []
+    for i in range(canais):
+        nome = f"{rnd.choice(PALAVRAS)} TV {i}"
+        url = f"https://live{i % 40}.example/{i}/index.m3u8"
+        lista.append({
+            "type": "tv", "title": nome, "tvg_id": f"{nome.replace(' ', '')}.br@SD",
+            "tvg_logo": f"https://logo.example/{i}.png" if i % 5 else "",
+            "group": rnd.choice(GRUPOS_TV), "url": url,
+            "episodes": [{"url": url, "title": "AO VIVO"}],
+        })
+    (web / "channels.json").write_text(json.dumps(lista, ensure_ascii=False), encoding="utf-8")
+
+    return {
+        "series": series, "temporadas": temporadas, "episodios": episodios,
+        "filmes": filmes, "canais": canais, "seed": seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um catálogo sintético para benchmarks")
+    parser.add_argument("destino", type=Path)
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--temporadas", type=int, default=3)
+    parser.add_argument("--episodios", type=int, default=24)
+    parser.add_argument("--filmes", type=int, default=500)
+    parser.add_argument("--canais", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    resumo = gerar_catalogo(args.destino, args.series, args.temporadas, args.episodios,
+                            args.filmes, args.canais, args.seed)
+    print(f"✅ Catálogo sintético em {args.destino}: {resumo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,26 @@
 import os
 import json
 import re
+import hashlib
+import io
+import time
+import threading
+import contextlib
+import sqlite3
+import gzip
+from xml.sax.saxutils import escape as xml_escape, quoteattr as xml_quoteattr
+from urllib.parse import urlencode
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import requests
 import unicodedata
 from pathlib import Path
-from datetime import datetime, timedelta
-from utils import normalize_tv_group
+from datetime import datetime, timedelta, timezone
+from utils import (normalize_tv_group, iter_m3u, dumps_json, write_json, precompress,
+                   drop_precompressed, report_sizes, pretty_output, PRETTY_ENV,
+                   write_if_changed, atomic_open, emitted_changed, emit_summary,
+                   REPORT, REPORT_PATH, stage, count, profiled,
+                   catalog_entry, tv_entry, update_catalog_files,
+                   Episode, Season, Title, Channel, record_to_dict)
 
 # =========================
 # FUNÇÕES AUXILIARES
@@ -36,58 +52,68 @@ def extract_series_name(filename):
     name = re.sub(r'\s+\d+$', '', name)
     return name
 
+# Padrões de número de episódio, em ordem de prioridade. Cada alternativa é
+# ".*?padrão", então o primeiro padrão que casa em qualquer posição vence
+# (como o antigo laço de re.search); a última é o fallback "último número".
+EPISODE_NUMBER_PATTERNS = [
+    r'EP?\s*(\d+)',
+    r'Episódio\s*(\d+)',
+    r'Capítulo\s*(\d+)',
+    r'(\d+)\s*-\s*',
+    r'^\s*(\d+)\s*$',
+    r'E(\d+)',
+    r'Ep\.\s*(\d+)',
+    r'#(\d+)',
+]
+_EPISODE_NUMBER_RE = re.compile(
+    '^(?:' + '|'.join(f'.*?{p}' for p in EPISODE_NUMBER_PATTERNS) + r'|.*?(\d+)\D*$)',
+    re.IGNORECASE | re.DOTALL,
+)
+_SEASON_NUMBER_RE = re.compile(
+    r'^(?:.*?(?:_T|_S|_Season|_Temporada)(\d+)|.*?_(\d+)$)',
+    re.IGNORECASE | re.DOTALL,
+)
+_CHAPTER_PREFIX_RE = re.compile(r'^Cap[ií]tulo\s*\d+\s*-\s*', re.IGNORECASE)
+_EP_PREFIX_RE      = re.compile(r'^E\d+\s*-\s*', re.IGNORECASE)
+_EPISODE_PREFIX_RE = re.compile(r'^Epis[oó]dio\s*\d+\s*-\s*', re.IGNORECASE)
+
 def extract_season_number(filename):
     """Extrai número da temporada"""
-    patterns = [
-        r'(?:_T|_S|_Season|_Temporada)(\d+)',
-        r'_(\d+)$'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, filename, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
+    match = _SEASON_NUMBER_RE.match(filename)
+    if match:
+        return int(match.group(match.lastindex))
     return 1
 
+def extract_episode_numbers(titles):
+    """Extrai números de episódio de uma lista de títulos (uma regex compilada, uma passada).
+
+    Mesma precedência de extract_episode_number; None para títulos sem número.
+    """
+    match = _EPISODE_NUMBER_RE.match
+    numbers = []
+    for title in titles:
+        m = match(title)
+        numbers.append(int(m.group(m.lastindex)) if m else None)
+    return numbers
+
 def extract_episode_number(title):
     """Extrai número do episódio do título"""
-    patterns = [
-        r'EP?\s*(\d+)',
-        r'Episódio\s*(\d+)',
-        r'Capítulo\s*(\d+)',
-        r'(\d+)\s*-\s*',
-        r'^\s*(\d+)\s*$',
-        r'E(\d+)',
-        r'Ep\.\s*(\d+)',
-        r'#(\d+)'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, title, re.IGNORECASE)
-        if match:
-            try:
-                return int(match.group(1))
-            except:
-                continue
-    numbers = re.findall(r'\d+', title)
-    if numbers:
-        try:
-            return int(numbers[-1])
-        except:
-            pass
-    return None
+    return extract_episode_numbers([title])[0]
 
 
 def clean_episode_title(raw_title, episode_num, prefix='Ep', is_chapter=False):
     """Formata título de episódio removendo prefixos redundantes. Elimina duplicação de código."""
     if raw_title and raw_title not in (f'Episódio {episode_num}', f'Capítulo {episode_num}'):
         if is_chapter:
-            titulo_limpo = re.sub(r'^Cap[ií]tulo\s*\d+\s*-\s*', '', raw_title, flags=re.IGNORECASE)
+            titulo_limpo = _CHAPTER_PREFIX_RE.sub('', raw_title)
         else:
-            titulo_limpo = re.sub(r'^E\d+\s*-\s*', '', raw_title, flags=re.IGNORECASE)
-            titulo_limpo = re.sub(r'^Epis[oó]dio\s*\d+\s*-\s*', '', titulo_limpo, flags=re.IGNORECASE)
+            titulo_limpo = _EP_PREFIX_RE.sub('', raw_title)
+            titulo_limpo = _EPISODE_PREFIX_RE.sub('', titulo_limpo)
         return titulo_limpo.strip() or raw_title
     return None
 
 
+
 def normalize_poster_url(poster, base_url):
     """Normaliza URL de poster para URL absoluta. Elimina duplicação no EPG."""
     if not poster:
@@ -104,56 +130,115 @@ def parse_m3u(m3u_file):
     """Faz parse de arquivo M3U e extrai números de episódios"""
     episodes = []
     try:
-        with open(m3u_file, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = [line.strip() for line in f if line.strip()]
-        episode_num = 1
-        for i in range(len(lines)):
-            if lines[i].startswith('#EXTINF:'):
-                if i + 1 < len(lines) and not lines[i + 1].startswith('#'):
-                    parts = lines[i].split(',', 1)
-                    raw_title = parts[1] if len(parts) > 1 else f"Episódio {episode_num}"
-                    ep_number = extract_episode_number(raw_title)
-                    episodes.append({
-                        'title': raw_title.strip(),
-                        'url': lines[i + 1].strip(),
-                        'episode': ep_number or episode_num
-                    })
-                    episode_num += 1
+        for episode_num, entry in enumerate(iter_m3u(m3u_file), 1):
+            raw_title = entry.title if entry.title is not None else f"Episódio {episode_num}"
+            episodes.append(Episode(title=raw_title, url=entry.url, episode=episode_num))
+        # Números extraídos de uma vez, com a regex única
+        numbers = extract_episode_numbers([ep.title for ep in episodes])
+        for ep, ep_number in zip(episodes, numbers):
+            ep.episode = ep_number or ep.episode
         return episodes
     except Exception as e:
         print(f"      ⚠️  Parse error: {m3u_file.name} - {e}")
         return []
 
-def get_poster_path_direct(item_name, category=""):
-    """Retorna path da capa compatível com GitHub Pages e Vercel"""
-    base_dir = Path(__file__).parent
-    capas_dir = base_dir / "assets" / "Capas"
-    BASE_URL = "/Pirataflix" if (base_dir / ".github").exists() else ""
-    DEFAULT_POSTER = f"{BASE_URL}/assets/Capas/default.jpg"
+POSTER_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
 
-    if not capas_dir.exists():
-        return DEFAULT_POSTER
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
 
-    name_slug = slugify(item_name)
-    extensions = [".jpg", ".jpeg", ".png", ".webp"]
-    candidates = []
-    for ext in extensions:
-        candidates.append(f"{name_slug}{ext}")
-        if category:
-            candidates.append(f"{name_slug}_{slugify(category)}{ext}")
 
-    for filename in candidates:
-        file_path = capas_dir / filename
-        if file_path.exists():
-            return f"{BASE_URL}/assets/Capas/{filename}"
+class PosterIndex:
+    """Índice em memória de assets/Capas, montado uma vez por execução (e por processo).
 
-    for file in capas_dir.iterdir():
-        if file.suffix.lower() in extensions:
-            file_slug = slugify(file.stem)
-            if name_slug in file_slug or file_slug in name_slug:
-                return f"{BASE_URL}/assets/Capas/{file.name}"
+    - Busca exata: nomes de arquivo num set (sem Path.exists()).
+    - Fallback aproximado (slug do título contido no slug da capa ou vice-versa):
+      slug → posição, para achar capas contidas no título, e trigramas → posições,
+      para achar capas que contêm o título. O resultado é o mesmo da varredura
+      linear antiga (primeira capa na ordem do diretório), memorizado por slug.
+    """
 
-    return DEFAULT_POSTER
+    def __init__(self, base_dir):
+        capas_dir     = base_dir / "assets" / "Capas"
+        self.base_url = "/Pirataflix" if (base_dir / ".github").exists() else ""
+        self.default  = f"{self.base_url}/assets/Capas/default.jpg"
+        self.exists   = capas_dir.exists()
+        self.names    = set()
+        self.entries  = []   # (slug, nome do arquivo) na ordem do diretório
+        self.by_slug  = {}   # slug → primeira posição em entries
+        self.by_gram  = {}   # trigrama → posições em entries
+        self._fuzzy   = {}
+        if not self.exists:
+            return
+        for file in capas_dir.iterdir():
+            self.names.add(file.name)
+            if file.suffix.lower() not in POSTER_EXTENSIONS:
+                continue
+            slug = slugify(file.stem)
+            idx  = len(self.entries)
+            self.entries.append((slug, file.name))
+            self.by_slug.setdefault(slug, idx)
+            for gram in _trigrams(slug):
+                self.by_gram.setdefault(gram, []).append(idx)
+
+    def url(self, filename):
+        return f"{self.base_url}/assets/Capas/{filename}"
+
+    def fuzzy(self, name_slug):
+        """Primeira capa cujo slug contém name_slug ou está contido nele (ou None)."""
+        if name_slug in self._fuzzy:
+            return self._fuzzy[name_slug]
+        count('posters.fuzzy')
+        best = None
+        # Capas contidas no título: todo trecho do slug do título é candidato
+        size = len(name_slug)
+        for i in range(size + 1):
+            for j in range(i, size + 1):
+                idx = self.by_slug.get(name_slug[i:j])
+                if idx is not None and (best is None or idx < best):
+                    best = idx
+        # Capas que contêm o título: precisam ter todos os trigramas dele
+        grams = _trigrams(name_slug)
+        if grams:
+            postings   = sorted((self.by_gram.get(g, []) for g in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = range(len(self.entries))
+        for idx in candidates:
+            if (best is None or idx < best) and name_slug in self.entries[idx][0]:
+                best = idx
+        result = self.entries[best][1] if best is not None else None
+        self._fuzzy[name_slug] = result
+        return result
+
+    def lookup(self, item_name, category=""):
+        if not self.exists:
+            return self.default
+        name_slug = slugify(item_name)
+        cat_slug  = slugify(category) if category else ""
+        for ext in POSTER_EXTENSIONS:
+            if f"{name_slug}{ext}" in self.names:
+                return self.url(f"{name_slug}{ext}")
+            if cat_slug and f"{name_slug}_{cat_slug}{ext}" in self.names:
+                return self.url(f"{name_slug}_{cat_slug}{ext}")
+        filename = self.fuzzy(name_slug)
+        return self.url(filename) if filename else self.default
+
+
+_POSTER_INDEX = None
+
+def get_poster_index():
+    """PosterIndex compartilhado por todos os process_* (criado na primeira chamada)."""
+    global _POSTER_INDEX
+    if _POSTER_INDEX is None:
+        _POSTER_INDEX = PosterIndex(Path(__file__).parent)
+    return _POSTER_INDEX
+
+def get_poster_path_direct(item_name, category=""):
+    """Retorna path da capa compatível com GitHub Pages e Vercel"""
+    count('posters.lookups')
+    with stage('posters'):
+        return get_poster_index().lookup(item_name, category)
 
 # =========================
 # FUNÇÕES DE PROCESSAMENTO
@@ -166,13 +251,13 @@ def process_movie(m3u_file, output_list, category):
         if episodes:
             poster_path = get_poster_path_direct(movie_name, "filme")
             item_id = slugify(movie_name)
-            movie_data = {
-                'id': item_id,
-                'title': movie_name,
-                'poster': poster_path,
-                'episodes': episodes,
-                'type': 'movie'
-            }
+            movie_data = Title(
+                id=item_id,
+                title=movie_name,
+                poster=poster_path,
+                episodes=episodes,
+                type='movie'
+            )
             output_list.append(movie_data)
             print(f"   🎬 {movie_name} - {len(episodes)} link(s) (ID: {item_id})")
     except Exception as e:
@@ -188,15 +273,15 @@ def process_single_m3u(m3u_file, output_list, folder_name, category, series_name
             return
         poster_path = get_poster_path_direct(series_name, category)
         item_id = slugify(series_name)
-        series_data = {
-            'id': item_id,
-            'title': series_name,
-            'poster': poster_path,
-            'seasons': [{'season': 1, 'episodes': episodes}],
-            'episodes': episodes,
-            'type': 'series',
-            'category': category
-        }
+        series_data = Title(
+            id=item_id,
+            title=series_name,
+            poster=poster_path,
+            seasons=[Season(season=1, episodes=episodes)],
+            episodes=episodes,
+            type='series',
+            category=category
+        )
         output_list.append(series_data)
         print(f"   📺 {series_name}: 1 temporada, {len(episodes)} episódios (ID: {item_id})")
     except Exception as e:
@@ -206,20 +291,20 @@ def process_multi_m3u(series_name, m3u_files, output_list, folder_name, category
     try:
         series_id = slugify(series_name)
         poster_path = get_poster_path_direct(series_name, category)
-        series_data = {
-            'id': series_id,
-            'title': series_name,
-            'poster': poster_path,
-            'seasons': [],
-            'type': 'series',
-            'category': category
-        }
+        series_data = Title(
+            id=series_id,
+            title=series_name,
+            poster=poster_path,
+            seasons=[],
+            type='series',
+            category=category
+        )
         m3u_files.sort()
         for m3u_file in m3u_files:
             season_num = extract_season_number(m3u_file.stem)
             episodes = parse_m3u(m3u_file)
             if episodes:
-                series_data['seasons'].append({'season': season_num, 'episodes': episodes})
+                series_data['seasons'].append(Season(season=season_num, episodes=episodes))
         series_data['seasons'].sort(key=lambda x: x['season'])
         if len(series_data['seasons']) == 1:
             series_data['episodes'] = series_data['seasons'][0]['episodes']
@@ -262,14 +347,29 @@ def process_series_folder(folder, output_list, folder_name, category):
 # =========================
 
 def generate_m3u_with_grouping(data, output_dir):
+    """Gera vod_grouped.m3u escrevendo cada entrada direto no arquivo (memória constante).
+    A contagem por grupo é feita durante a geração, sem reler o texto.
+    """
     M3U_FILE = os.path.join(output_dir, "vod_grouped.m3u")
     BASE_URL = "https://alberttartas.github.io/Pirataflix"
-    
-    m3u = f'#EXTM3U x-tvg-url="{BASE_URL}/iptv_playlists/epg.xml"\n'
-    m3u += '#PLAYLIST-VERSION:2024\n#GENERATED-BY:Pirataflix\n#ENCODING:UTF-8\n\n'
+    groups = {}
+
+    with atomic_open(M3U_FILE, "w", encoding="utf-8", buffering=1 << 16) as out:
+        _write_grouped_entries(out, data, groups, BASE_URL)
+
+    print(f"\n✅ M3U gerado: {M3U_FILE}")
+    for group, n in groups.items():
+        print(f"   {group}: {n} itens")
+    print(f"\n📡 URL da playlist: {BASE_URL}/iptv_playlists/vod_grouped.m3u")
+    return M3U_FILE
+
+def _write_grouped_entries(out, data, groups, BASE_URL):
+    """Emite o conteúdo do vod_grouped.m3u em `out`, contando as entradas por grupo em `groups`."""
+    write = out.write
+    write(f'#EXTM3U x-tvg-url="{BASE_URL}/iptv_playlists/epg.xml"\n')
+    write('#PLAYLIST-VERSION:2024\n#GENERATED-BY:Pirataflix\n#ENCODING:UTF-8\n\n')
 
     def add_item(title, url, group, logo="", tvg_id="", tvg_name=""):
-        nonlocal m3u, BASE_URL
         if logo:
             if logo.startswith("/Pirataflix"):
                 logo = f"{BASE_URL}{logo[len('/Pirataflix'):]}"
@@ -280,240 +380,462 @@ def generate_m3u_with_grouping(data, output_dir):
             elif not logo.startswith("http") and not logo.startswith(BASE_URL):
                 filename = os.path.basename(logo)
                 logo = f"{BASE_URL}/assets/Capas/{filename}"
-        m3u += f'#EXTINF:-1 group-title="{group}" tvg-id="{tvg_id}" tvg-logo="{logo}",{title}\n'
-        m3u += f"{url}\n\n"
+        write(f'#EXTINF:-1 group-title="{group}" tvg-id="{tvg_id}" tvg-logo="{logo}",{title}\n{url}\n\n')
+        groups[group] = groups.get(group, 0) + 1
 
     for movie in data.get("filmes", []):
-        movie_id = movie.get("id", slugify(movie["title"]))
+        movie_id = movie.id or slugify(movie.title)
         tvg_id = movie_id.upper()
-        for ep in movie.get("episodes", []):
-            add_item(title=movie["title"], url=ep["url"], group="🎬 Filmes",
-                     logo=movie.get("poster", ""), tvg_id=tvg_id, tvg_name=movie["title"])
+        for ep in movie.episodes or []:
+            add_item(title=movie.title, url=ep.url, group="🎬 Filmes",
+                     logo=movie.poster or "", tvg_id=tvg_id, tvg_name=movie.title)
 
     for serie in data.get("series", []):
-        serie_id = serie.get("id", slugify(serie["title"])).upper()
-        if serie.get("seasons"):
-            for season in serie["seasons"]:
-                season_num = season.get("season", 1)
+        serie_id = (serie.id or slugify(serie.title)).upper()
+        if serie.seasons:
+            for season in serie.seasons:
+                season_num = season.season
                 tvg_id = f"{serie_id}_T{season_num:02d}"
-                tvg_name = f"{serie['title']} - Temporada {season_num}"
-                for ep in season.get("episodes", []):
-                    episode_num = ep.get("episode", 0)
-                    titulo_limpo = clean_episode_title(ep.get("title"), episode_num)
+                tvg_name = f"{serie.title} - Temporada {season_num}"
+                for ep in season.episodes or []:
+                    episode_num = ep.episode or 0
+                    titulo_limpo = clean_episode_title(ep.title, episode_num)
                     episode_title = (
                         f"S{season_num:02d}E{episode_num:02d} - {titulo_limpo}"
                         if titulo_limpo else f"S{season_num:02d}E{episode_num:02d}"
                     )
-                    add_item(title=episode_title, url=ep["url"], group="📺 Séries",
-                             logo=serie.get("poster", ""), tvg_id=tvg_id, tvg_name=tvg_name)
-        elif serie.get("episodes"):
+                    add_item(title=episode_title, url=ep.url, group="📺 Séries",
+                             logo=serie.poster or "", tvg_id=tvg_id, tvg_name=tvg_name)
+        elif serie.episodes:
             tvg_id = f"{serie_id}_T01"
-            for ep in serie["episodes"]:
-                episode_num = ep.get("episode", 0)
-                titulo_limpo = clean_episode_title(ep.get("title"), episode_num)
+            for ep in serie.episodes:
+                episode_num = ep.episode or 0
+                titulo_limpo = clean_episode_title(ep.title, episode_num)
                 episode_title = (
                     f"Ep {episode_num:02d} - {titulo_limpo}"
                     if titulo_limpo else f"Ep {episode_num:02d}"
                 )
-                add_item(title=episode_title, url=ep["url"], group="📺 Séries",
-                         logo=serie.get("poster", ""), tvg_id=tvg_id, tvg_name=serie["title"])
+                add_item(title=episode_title, url=ep.url, group="📺 Séries",
+                         logo=serie.poster or "", tvg_id=tvg_id, tvg_name=serie.title)
 
     for novela in data.get("novelas", []):
-        novela_id = novela.get("id", slugify(novela["title"])).upper()
-        if novela.get("seasons"):
-            for season in novela["seasons"]:
-                season_num = season.get("season", 1)
+        novela_id = (novela.id or slugify(novela.title)).upper()
+        if novela.seasons:
+            for season in novela.seasons:
+                season_num = season.season
                 tvg_id = f"{novela_id}_T{season_num:02d}"
-                tvg_name = f"{novela['title']} - Temporada {season_num}"
-                for ep in season.get("episodes", []):
-                    episode_num = ep.get("episode", 0)
-                    titulo_limpo = clean_episode_title(ep.get("title"), episode_num, is_chapter=True)
+                tvg_name = f"{novela.title} - Temporada {season_num}"
+                for ep in season.episodes or []:
+                    episode_num = ep.episode or 0
+                    titulo_limpo = clean_episode_title(ep.title, episode_num, is_chapter=True)
                     episode_title = (
                         f"Cap {episode_num:02d} - {titulo_limpo}"
                         if titulo_limpo else f"Cap {episode_num:02d}"
                     )
-                    add_item(title=episode_title, url=ep["url"], group="📖 Novelas",
-                             logo=novela.get("poster", ""), tvg_id=tvg_id, tvg_name=tvg_name)
+                    add_item(title=episode_title, url=ep.url, group="📖 Novelas",
+                             logo=novela.poster or "", tvg_id=tvg_id, tvg_name=tvg_name)
 
     for anime in data.get("animes", []):
-        anime_id = anime.get("id", slugify(anime["title"])).upper()
-        if anime.get("seasons"):
-            for season in anime["seasons"]:
-                season_num = season.get("season", 1)
+        anime_id = (anime.id or slugify(anime.title)).upper()
+        if anime.seasons:
+            for season in anime.seasons:
+                season_num = season.season
                 tvg_id = f"{anime_id}_T{season_num:02d}"
-                tvg_name = f"{anime['title']} - Temporada {season_num}"
-                for ep in season.get("episodes", []):
-                    episode_num = ep.get("episode", 0)
-                    titulo_limpo = clean_episode_title(ep.get("title"), episode_num)
+                tvg_name = f"{anime.title} - Temporada {season_num}"
+                for ep in season.episodes or []:
+                    episode_num = ep.episode or 0
+                    titulo_limpo = clean_episode_title(ep.title, episode_num)
                     episode_title = (
                         f"Ep {episode_num:02d} - {titulo_limpo}"
                         if titulo_limpo else f"Ep {episode_num:02d}"
                     )
-                    add_item(title=episode_title, url=ep["url"], group="👻 Animes",
-                             logo=anime.get("poster", ""), tvg_id=tvg_id, tvg_name=tvg_name)
+                    add_item(title=episode_title, url=ep.url, group="👻 Animes",
+                             logo=anime.poster or "", tvg_id=tvg_id, tvg_name=tvg_name)
 
     for infantil in data.get("infantil", []):
-        infantil_id = infantil.get("id", slugify(infantil["title"])).upper()
-        if infantil.get("seasons"):
-            for season in infantil["seasons"]:
-                season_num = season.get("season", 1)
+        infantil_id = (infantil.id or slugify(infantil.title)).upper()
+        if infantil.seasons:
+            for season in infantil.seasons:
+                season_num = season.season
                 tvg_id = f"{infantil_id}_T{season_num:02d}"
-                tvg_name = f"{infantil['title']} - Temporada {season_num}"
-                for ep in season.get("episodes", []):
-                    titulo_limpo = clean_episode_title(ep.get("title"), episode_num)
+                tvg_name = f"{infantil.title} - Temporada {season_num}"
+                for ep in season.episodes or []:
+                    titulo_limpo = clean_episode_title(ep.title, episode_num)
                     episode_title = (
                         f"Ep {episode_num:02d} - {titulo_limpo}"
                         if titulo_limpo else f"Ep {episode_num:02d}"
                     )
-                    add_item(title=episode_title, url=ep["url"], group="🧸 Infantil",
-                             logo=infantil.get("poster", ""), tvg_id=tvg_id, tvg_name=tvg_name)
+                    add_item(title=episode_title, url=ep.url, group="🧸 Infantil",
+                             logo=infantil.poster or "", tvg_id=tvg_id, tvg_name=tvg_name)
 
     for canal in data.get("tv", []):
-        canal_id = (canal.get("tvg_id") or slugify(canal.get("title", ""))).upper()
-        add_item(title=canal.get("title", "Canal sem nome"), url=canal.get("url", ""),
-                 group=canal.get("group", "📺 TV"), logo=canal.get("tvg_logo", ""),
-                 tvg_id=canal_id, tvg_name=canal.get("title", ""))
-
-    with open(M3U_FILE, "w", encoding="utf-8") as f:
-        f.write(m3u)
-
-    print(f"\n✅ M3U gerado: {M3U_FILE}")
-    groups = {}
-    for line in m3u.split('\n'):
-        if line.startswith('#EXTINF:'):
-            group_match = re.search(r'group-title="([^"]*)"', line)
-            if group_match:
-                group = group_match.group(1)
-                groups[group] = groups.get(group, 0) + 1
-    for group, count in groups.items():
-        print(f"   {group}: {count} itens")
-    print(f"\n📡 URL da playlist: {BASE_URL}/iptv_playlists/vod_grouped.m3u")
-    return M3U_FILE
+        canal_id = (canal.tvg_id or slugify(canal.title or "")).upper()
+        add_item(title=canal.title or "Canal sem nome", url=canal.url or "",
+                 group=canal.group or "📺 TV", logo=canal.tvg_logo or "",
+                 tvg_id=canal_id, tvg_name=canal.title or "")
 
 # =========================
 # GERADOR EPG
 # =========================
 
-def generate_epg(data, output_dir):
-    EPG_FILE = os.path.join(output_dir, "epg.xml")
-    epg = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    epg += '<tv generator-info-name="Pirataflix VOD">\n'
-    print("📺 Gerando EPG básico...")
+EPG_HORIZON_HOURS = 24    # janela da programação gerada
+EPG_SLOT_MINUTES  = 60    # duração de cada slot de episódio
+EPG_MOVIE_MINUTES = 120   # duração de um slot de filme
+EPG_SITE_URL      = "https://pirataflix-seven.vercel.app/"
 
+def _epg_channels(data, base_url):
+    """Calcula uma vez, por canal: (channel_id, display-name, ícone, bloco <programme> sem horários).
+    Textos já saem escapados para XML.
+    """
     category_map = {
         "filmes": "🎬 Filmes", "series": "📺 Séries",
         "novelas": "💖 Novelas", "animes": "👻 Animes", "infantil": "🧸 Infantil"
     }
-    BASE_URL = "https://alberttartas.github.io/Pirataflix"
-
+    channels = []
     for category, cat_name in category_map.items():
-        items = data.get(category, [])
-        for item in items:
-            base_id = item.get("id", slugify(item["title"])).upper().replace('_', '')
+        cat_xml = xml_escape(cat_name)
+        for item in data.get(category, []):
+            base_id   = (item.id or slugify(item.title)).upper().replace('_', '')
+            title_xml = xml_escape(item.title)
+            icon      = normalize_poster_url(item.poster, base_url) if item.poster else ""
             if category == "filmes":
                 channel_id = f"FILME.{base_id}"
-                epg += f'  <channel id="{channel_id}">\n'
-                epg += f'    <display-name>{item["title"]}</display-name>\n'
-                if item.get("poster"):
-                    poster_url = normalize_poster_url(item["poster"], BASE_URL)
-                    epg += f'    <icon src="{poster_url}"/>\n'
-                epg += f'    <url>https://pirataflix-seven.vercel.app/</url>\n'
-                epg += '  </channel>\n'
-            elif category in ["series", "novelas", "animes", "infantil"]:
-                if item.get("seasons"):
-                    for season in item["seasons"]:
-                        season_num = season.get("season", 1)
-                        channel_id = f"{base_id}.T{season_num:02d}"
-                        epg += f'  <channel id="{channel_id}">\n'
-                        epg += f'    <display-name>{item["title"]} - Temporada {season_num}</display-name>\n'
-                        if item.get("poster"):
-                            poster_url = normalize_poster_url(item["poster"], BASE_URL)
-                            epg += f'    <icon src="{poster_url}"/>\n'
-                        epg += f'    <url>https://pirataflix-seven.vercel.app/</url>\n'
-                        epg += '  </channel>\n'
-
-    now = datetime.utcnow()
-    for hour in range(24):
-        current_time = now + timedelta(hours=hour)
-        time_str = current_time.strftime("%Y%m%d%H%M%S +0000")
-        for category, cat_name in category_map.items():
-            items = data.get(category, [])
-            for item in items:
-                base_id = item.get("id", slugify(item["title"])).upper().replace('_', '')
-                if category == "filmes":
-                    channel_id = f"FILME.{base_id}"
-                    for ep in item.get("episodes", [])[:1]:
-                        end = (current_time + timedelta(hours=2)).strftime("%Y%m%d%H%M%S +0000")
-                        epg += f'  <programme channel="{channel_id}" start="{time_str}" stop="{end}">\n'
-                        epg += f'    <title>{item["title"]}</title>\n'
-                        epg += f'    <desc>🎬 {item["title"]}</desc>\n'
-                        epg += f'    <category>{cat_name}</category>\n'
-                        epg += '  </programme>\n'
-                elif category in ["series", "novelas", "animes", "infantil"]:
-                    if item.get("seasons"):
-                        for season in item["seasons"]:
-                            season_num = season.get("season", 1)
-                            channel_id = f"{base_id}.T{season_num:02d}"
-                            for ep in season.get("episodes", [])[:1]:
-                                episode_num = ep.get("episode", 1)
-                                end = (current_time + timedelta(hours=1)).strftime("%Y%m%d%H%M%S +0000")
-                                epg += f'  <programme channel="{channel_id}" start="{time_str}" stop="{end}">\n'
-                                epg += f'    <title>{item["title"]} - Episódio {episode_num}</title>\n'
-                                epg += f'    <desc>{cat_name} - {item["title"]} Temporada {season_num}</desc>\n'
-                                epg += f'    <category>{cat_name}</category>\n'
-                                epg += f'    <episode-num system="onscreen">S{season_num:02d}E{episode_num:02d}</episode-num>\n'
-                                epg += '  </programme>\n'
-
-    epg += "</tv>"
-    os.makedirs(output_dir, exist_ok=True)
-    with open(EPG_FILE, "w", encoding="utf-8") as f:
-        f.write(epg)
-    print(f"✅ EPG gerado: {EPG_FILE}")
+                programme  = None
+                if item.episodes:
+                    programme = (f'    <title>{title_xml}</title>\n'
+                                 f'    <desc>🎬 {title_xml}</desc>\n'
+                                 f'    <category>{cat_xml}</category>\n')
+                channels.append((channel_id, title_xml, icon, programme, EPG_MOVIE_MINUTES))
+                continue
+            for season in item.seasons or []:
+                season_num = season.season
+                channel_id = f"{base_id}.T{season_num:02d}"
+                programme  = None
+                if season.episodes:
+                    episode_num = season.episodes[0].episode or 1
+                    programme = (f'    <title>{title_xml} - Episódio {episode_num}</title>\n'
+                                 f'    <desc>{cat_xml} - {title_xml} Temporada {season_num}</desc>\n'
+                                 f'    <category>{cat_xml}</category>\n'
+                                 f'    <episode-num system="onscreen">S{season_num:02d}E{episode_num:02d}</episode-num>\n')
+                channels.append((channel_id, f"{title_xml} - Temporada {season_num}", icon, programme, None))
+    return channels
+
+def generate_epg(data, output_dir, horizon_hours=EPG_HORIZON_HOURS, slot_minutes=EPG_SLOT_MINUTES,
+                 gzip_output=False):
+    """Gera epg.xml (XMLTV) em streaming; com gzip_output também grava epg.xml.gz na mesma passada.
+    Canais e blocos de programa são montados uma vez; cada slot só formata os horários.
+    """
+    EPG_FILE = os.path.join(output_dir, "epg.xml")
+    BASE_URL = "https://alberttartas.github.io/Pirataflix"
+    print("📺 Gerando EPG básico...")
+
+    channels = _epg_channels(data, BASE_URL)
+    slot     = timedelta(minutes=slot_minutes)
+    n_slots  = max(1, int(horizon_hours * 60 // slot_minutes))
+    # Início alinhado ao slot corrente: o arquivo não muda a cada segundo
+    now   = datetime.now(timezone.utc).replace(tzinfo=None)
+    start = datetime(now.year, now.month, now.day) + slot * ((now - datetime(now.year, now.month, now.day)) // slot)
+
+    def fmt(dt):
+        return dt.strftime("%Y%m%d%H%M%S +0000")
+
+    with contextlib.ExitStack() as stack:
+        outputs = [stack.enter_context(atomic_open(EPG_FILE, "w", encoding="utf-8", buffering=1 << 16))]
+        if gzip_output:
+            raw = stack.enter_context(atomic_open(EPG_FILE + ".gz", "wb"))
+            gz  = stack.enter_context(gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9, mtime=0))
+            outputs.append(stack.enter_context(io.TextIOWrapper(gz, encoding="utf-8")))
+
+        def write(chunk):
+            for out in outputs:
+                out.write(chunk)
+
+        write('<?xml version="1.0" encoding="UTF-8"?>\n<tv generator-info-name="Pirataflix VOD">\n')
+        for channel_id, display_name, icon, _, _ in channels:
+            write(f'  <channel id="{channel_id}">\n    <display-name>{display_name}</display-name>\n')
+            if icon:
+                write(f'    <icon src={xml_quoteattr(icon)}/>\n')
+            write(f'    <url>{EPG_SITE_URL}</url>\n  </channel>\n')
+
+        programmes = [(cid, body, timedelta(minutes=dur) if dur else slot)
+                      for cid, _, _, body, dur in channels if body]
+        for i in range(n_slots):
+            current  = start + slot * i
+            time_str = fmt(current)
+            stops    = {}
+            for channel_id, body, duration in programmes:
+                stop = stops.get(duration)
+                if stop is None:
+                    stop = stops[duration] = fmt(current + duration)
+                write(f'  <programme channel="{channel_id}" start="{time_str}" stop="{stop}">\n'
+                      f'{body}  </programme>\n')
+        write("</tv>")
+    print(f"✅ EPG gerado: {EPG_FILE}" + (" (+ .gz)" if gzip_output else ""))
     return EPG_FILE
 
+# =========================
+# ESQUEMA DO DATA.JSON
+# v1: séries de temporada única repetem os episódios em item['episodes'] e seasons[0]['episodes']
+# v2: episódios só em seasons (filmes e títulos sem seasons mantêm 'episodes');
+#     chave "schema_version" no topo. --legacy-schema (ou PIRATAFLIX_LEGACY_SCHEMA=1) grava o v1
+#     enquanto web/shared.js, api/player_api.js e o app Tizen não migram.
+# =========================
+
+SCHEMA_VERSION = 2
+LEGACY_SCHEMA_ENV = 'PIRATAFLIX_LEGACY_SCHEMA'
+
+def legacy_schema(flag=False):
+    """True se o data.json deve sair no esquema v1 (flag --legacy-schema ou variável de ambiente)."""
+    return flag or os.environ.get(LEGACY_SCHEMA_ENV, '') not in ('', '0')
+
+def _schema_item(item, legacy=False):
+    """Título como vai para o disco: no v2, sem a cópia de 'episodes' quando há seasons.
+    Em memória o item continua com as duas listas (M3U, EPG e schedule usam 'episodes').
+    """
+    if legacy or not item.get('seasons') or 'episodes' not in item:
+        return item
+    return Title.from_dict({k: v for k, v in item.items() if k != 'episodes'})
+
+def catalog_for_schema(output, legacy=False):
+    """Catálogo no esquema de saída: v1 é o próprio output; v2 ganha schema_version e perde as duplicatas."""
+    if legacy:
+        return output
+    data = {'schema_version': SCHEMA_VERSION}
+    for key, items in output.items():
+        data[key] = [_schema_item(i) for i in items] if key in VOD_CATEGORIES else items
+    return data
+
+# =========================
+# CATÁLOGO FATIADO
+# catalog-index.json: só o que a grade e a busca mostram (cresce com o nº de títulos);
+# titles/<categoria>/<id>.json: item completo, buscado ao abrir o título
+# (entradas do índice: utils.catalog_entry)
+# =========================
+
+def write_catalog_shards(data, web_dir, pretty=False):
+    """Gera web/catalog-index.json, um shard por título em web/titles/<categoria>/<id>.json
+    e a lista compacta de canais web/tv.json. Shards de títulos removidos são apagados.
+    """
+    titles_dir = web_dir / "titles"
+    index, keep, written = {}, set(), 0
+    if 'schema_version' in data:
+        index['schema_version'] = data['schema_version']
+    for cat in VOD_CATEGORIES:
+        cat_dir = titles_dir / cat
+        cat_dir.mkdir(parents=True, exist_ok=True)
+        index[cat] = []
+        for item in data.get(cat, []):
+            index[cat].append(catalog_entry(item, cat))
+            shard = cat_dir / f"{item.id}.json"
+            keep.add(shard)
+            written += write_if_changed(shard, dumps_json(item, pretty))
+    removed = 0
+    for shard in titles_dir.glob("*/*.json"):
+        if shard not in keep:
+            shard.unlink()
+            removed += 1
+    print(f"🗂️  Catálogo fatiado: {len(keep)} títulos, {written} shard(s) gravado(s), {removed} removido(s)")
+    write_json(web_dir / "catalog-index.json", index, pretty)
+    write_json(web_dir / "tv.json", [tv_entry(c) for c in data.get('tv', [])], pretty)
+
+# =========================
+# MANIFESTO INCREMENTAL
+# Títulos cujos .m3u não mudaram são servidos do build anterior
+# =========================
+
+MANIFEST_PATH    = Path(__file__).parent / "cache" / "build_manifest.json"
+MANIFEST_VERSION = 1
+
+def _sha1_file(path):
+    """SHA-1 do conteúdo do arquivo, lido em blocos."""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _build_fingerprint(base_dir):
+    """Hash do código do build e da pasta de capas.
+    Se qualquer um mudar, os registros salvos deixam de valer (parse ou poster podem mudar).
+    """
+    h = hashlib.sha1(f"v{MANIFEST_VERSION}".encode())
+    for nome in ('build.py', 'utils.py'):
+        arquivo = base_dir / nome
+        if arquivo.exists():
+            h.update(arquivo.read_bytes())
+    capas_dir = base_dir / "assets" / "Capas"
+    if capas_dir.exists():
+        for file in sorted(capas_dir.iterdir()):
+            h.update(file.name.encode('utf-8', 'surrogateescape') + b'\0')
+    h.update(b'gh' if (base_dir / ".github").exists() else b'local')
+    return h.hexdigest()
+
+
+class BuildManifest:
+    """Manifesto persistente: (path, size, mtime, sha1) → registros de título já processados.
+
+    Cada unidade (um filme, uma pasta de série ou um grupo de .m3u soltos) guarda a
+    assinatura dos seus arquivos. Se a assinatura bate, os registros do build anterior
+    são reaproveitados sem passar por parse_m3u/process_multi_m3u.
+    """
+
+    def __init__(self, base_dir, enabled=True):
+        self.base_dir    = base_dir
+        self.fingerprint = _build_fingerprint(base_dir)
+        self.old_files   = {}
+        self.old_units   = {}
+        self.files       = {}
+        self.units       = {}
+        self.hits        = 0
+        self.misses      = 0
+        if enabled and MANIFEST_PATH.exists():
+            try:
+                saved = json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
+                if saved.get('fingerprint') == self.fingerprint:
+                    self.old_files = saved.get('files', {})
+                    self.old_units = saved.get('units', {})
+                else:
+                    print("   ♻️  Código ou capas mudaram — manifesto descartado")
+            except Exception as e:
+                print(f"   ⚠️  Manifesto ilegível, reconstruindo: {e}")
+
+    def signature(self, paths):
+        """{path relativo: sha1} dos arquivos; só relê o conteúdo se size/mtime mudaram."""
+        sig = {}
+        for path in paths:
+            rel = path.relative_to(self.base_dir).as_posix()
+            st  = path.stat()
+            old = self.old_files.get(rel)
+            if old and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns:
+                digest = old['sha1']
+            else:
+                digest = _sha1_file(path)
+            self.files[rel] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha1': digest}
+            sig[rel] = digest
+        return sig
+
+    def get(self, key, sig):
+        """Registros salvos da unidade, ou None se algum arquivo mudou."""
+        unit = self.old_units.get(key)
+        if unit is not None and unit['files'] == sig:
+            unit['records'] = [Title.from_dict(r) for r in unit['records']]
+            self.units[key] = unit
+            self.hits += 1
+            return unit['records']
+        self.misses += 1
+        return None
+
+    def put(self, key, sig, records):
+        self.units[key] = {'files': sig, 'records': records}
+
+    def save(self):
+        """Grava o manifesto. Deve ser chamado antes do TMDB alterar os registros."""
+        MANIFEST_PATH.parent.mkdir(exist_ok=True)
+        manifest = {
+            'version':     MANIFEST_VERSION,
+            'fingerprint': self.fingerprint,
+            'files':       self.files,
+            'units':       self.units,
+        }
+        MANIFEST_PATH.write_text(json.dumps(manifest, ensure_ascii=False, default=record_to_dict),
+                                 encoding='utf-8')
+
+
+def _collect_units(cat_path, cat_folder, cat_id):
+    """Lista as unidades de processamento de uma categoria, na mesma ordem do build serial.
+    Cada unidade é (chave, tipo, arquivos .m3u, nome da série).
+    """
+    units = []
+    if cat_folder == 'Filmes':
+        m3u_files = list(cat_path.glob("*.m3u")) + list(cat_path.glob("*.m3u8"))
+        for m3u_file in m3u_files:
+            units.append((f"movie:{cat_folder}/{m3u_file.name}", 'movie', [m3u_file], None))
+        return units
+
+    root_m3u_files = list(cat_path.glob("*.m3u")) + list(cat_path.glob("*.m3u8"))
+    series_dict = {}
+    for m3u_file in root_m3u_files:
+        series_dict.setdefault(extract_series_name(m3u_file.stem), []).append(m3u_file)
+    for series_name, files in series_dict.items():
+        units.append((f"root:{cat_folder}/{series_name}", 'root', files, series_name))
+
+    for folder in [f for f in cat_path.iterdir() if f.is_dir()]:
+        m3u_files = list(folder.glob("*.m3u")) + list(folder.glob("*.m3u8"))
+        units.append((f"folder:{cat_folder}/{folder.name}", 'folder', m3u_files, folder))
+    return units
+
+def _process_unit(unit, cat_folder, cat_id):
+    """Processa uma unidade e devolve os registros de título gerados."""
+    key, kind, files, extra = unit
+    records = []
+    if kind == 'movie':
+        process_movie(files[0], records, cat_id)
+    elif kind == 'root':
+        if len(files) == 1:
+            process_single_m3u(files[0], records, cat_folder, cat_id, extra)
+        else:
+            process_multi_m3u(extra, files, records, cat_folder, cat_id)
+    else:
+        process_series_folder(extra, records, cat_folder, cat_id)
+    return records
+
+def _process_unit_captured(unit, cat_folder, cat_id):
+    """Versão para o pool de processos: devolve (registros, log, métricas) para o pai
+    imprimir em ordem e somar ao relatório."""
+    buffer = io.StringIO()
+    since  = REPORT.snapshot()
+    with contextlib.redirect_stdout(buffer):
+        records = _process_unit(unit, cat_folder, cat_id)
+    return records, buffer.getvalue(), REPORT.delta(since)
+
 # =========================
 # FUNÇÃO PRINCIPAL
 # =========================
 
-def build_vod_with_direct_capas():
+def build_vod_with_direct_capas(full_rebuild=False, jobs=1, refresh_tmdb=False,
+                                epg_hours=EPG_HORIZON_HOURS, epg_slot=EPG_SLOT_MINUTES, epg_gzip=False,
+                                pretty=False, legacy=False):
     base_dir = Path(__file__).parent
     categories = {
         'Filmes': 'filmes', 'Series': 'series', 'Novelas': 'novelas',
         'Animes': 'animes', 'Infantil': 'infantil'
     }
 
-    auto_dir = base_dir / "input_auto"
-    if auto_dir.exists():
-        print("\n📁 Pasta input_auto encontrada! Incluindo no processamento...")
-        arquivos_existentes = set()
-        for pasta in ['Filmes', 'Series', 'Novelas', 'Animes', 'Infantil', 'TV']:
-            pasta_input = base_dir / "input" / pasta
-            if pasta_input.exists():
-                for m3u in pasta_input.glob("*.m3u"):
-                    arquivos_existentes.add(m3u.name)
-        print(f"   📋 Arquivos já existentes: {len(arquivos_existentes)}")
-        copiados = 0
-        ignorados = 0
-        for subpasta in auto_dir.iterdir():
-            if subpasta.is_dir():
-                destino = base_dir / "input" / subpasta.name
-                destino.mkdir(exist_ok=True)
-                for m3u in subpasta.glob("*.m3u"):
-                    if m3u.name not in arquivos_existentes:
-                        import shutil
-                        shutil.copy2(m3u, destino / m3u.name)
-                        print(f"   ✅ Copiado: {subpasta.name}/{m3u.name}")
-                        copiados += 1
-                    else:
-                        print(f"   ⏭️  Ignorado (já existe): {subpasta.name}/{m3u.name}")
-                        ignorados += 1
-        print(f"   📊 Resumo: {copiados} copiados, {ignorados} ignorados")
+    with stage('input_auto'):
+        auto_dir = base_dir / "input_auto"
+        if auto_dir.exists():
+            print("\n📁 Pasta input_auto encontrada! Incluindo no processamento...")
+            arquivos_existentes = set()
+            for pasta in ['Filmes', 'Series', 'Novelas', 'Animes', 'Infantil', 'TV']:
+                pasta_input = base_dir / "input" / pasta
+                if pasta_input.exists():
+                    for m3u in pasta_input.glob("*.m3u"):
+                        arquivos_existentes.add(m3u.name)
+            print(f"   📋 Arquivos já existentes: {len(arquivos_existentes)}")
+            copiados = 0
+            ignorados = 0
+            for subpasta in auto_dir.iterdir():
+                if subpasta.is_dir():
+                    destino = base_dir / "input" / subpasta.name
+                    destino.mkdir(exist_ok=True)
+                    for m3u in subpasta.glob("*.m3u"):
+                        if m3u.name not in arquivos_existentes:
+                            import shutil
+                            shutil.copy2(m3u, destino / m3u.name)
+                            print(f"   ✅ Copiado: {subpasta.name}/{m3u.name}")
+                            copiados += 1
+                        else:
+                            print(f"   ⏭️  Ignorado (já existe): {subpasta.name}/{m3u.name}")
+                            ignorados += 1
+            print(f"   📊 Resumo: {copiados} copiados, {ignorados} ignorados")
 
     output = {cat_id: [] for cat_id in categories.values()}
 
     web_dir = base_dir / "web"
     web_dir.mkdir(exist_ok=True)
     json_path = web_dir / "data.json"
+    # Metadados TMDB do build anterior (antes de sobrescrever o data.json)
+    previous = {} if refresh_tmdb else load_previous_catalog(json_path)
 
     # Canais de TV sempre recarregados do channels.json com grupos normalizados.
     # Não reutilizamos data.json anterior para TV — ele pode ter grupos em inglês ou incorretos.
@@ -521,7 +843,7 @@ def build_vod_with_direct_capas():
     if channels_path.exists():
         try:
             with open(channels_path, 'r', encoding='utf-8') as f:
-                tv_canais = json.load(f)
+                tv_canais = [Channel.from_dict(c) for c in json.load(f)]
             for canal in tv_canais:
                 canal['group'] = normalize_tv_group(canal.get('group', ''))
             output['tv'] = tv_canais
@@ -533,52 +855,113 @@ def build_vod_with_direct_capas():
     print("🎬 SISTEMA VOD - CAPAS DIRETAS DA PASTA")
     print("============================================================")
 
-    for cat_folder, cat_id in categories.items():
-        cat_path = base_dir / "input" / cat_folder
-        if not cat_path.exists():
-            print(f"\n▶️  {cat_folder}: Pasta não existe")
-            continue
-        print(f"\n▶️  Processando: input/{cat_folder}")
-        if cat_folder == 'Filmes':
-            m3u_files = list(cat_path.glob("*.m3u")) + list(cat_path.glob("*.m3u8"))
-            for m3u_file in m3u_files:
-                process_movie(m3u_file, output[cat_id], cat_id)
-        else:
-            root_m3u_files = list(cat_path.glob("*.m3u")) + list(cat_path.glob("*.m3u8"))
-            if root_m3u_files:
-                process_root_m3u_files(root_m3u_files, output[cat_id], cat_folder, cat_id)
-            subfolders = [f for f in cat_path.iterdir() if f.is_dir()]
-            for folder in subfolders:
-                process_series_folder(folder, output[cat_id], cat_folder, cat_id)
-
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    print(f"\n✅ JSON salvo: {json_path}")
+    with stage('parse'):
+        manifest = BuildManifest(base_dir, enabled=not full_rebuild)
+
+        # 1) Descobrir unidades e consultar o manifesto (ordem fixa = ordem do build serial)
+        plan = []
+        for cat_folder, cat_id in categories.items():
+            cat_path = base_dir / "input" / cat_folder
+            if not cat_path.exists():
+                plan.append((cat_folder, cat_id, None))
+                continue
+            units = []
+            for unit in _collect_units(cat_path, cat_folder, cat_id):
+                sig = manifest.signature(unit[2])
+                units.append((unit, sig, manifest.get(unit[0], sig)))
+            plan.append((cat_folder, cat_id, units))
+
+        # 2) Unidades alteradas vão para o pool; o merge abaixo segue a ordem do plano,
+        #    então o data.json sai idêntico ao de uma execução serial.
+        pool    = None
+        futures = {}
+        if jobs > 1 and manifest.misses > 1:
+            workers = min(jobs, manifest.misses)
+            pool = ProcessPoolExecutor(max_workers=workers)
+            for cat_folder, cat_id, units in plan:
+                for unit, sig, records in units or []:
+                    if records is None:
+                        futures[unit[0]] = pool.submit(_process_unit_captured, unit, cat_folder, cat_id)
+            print(f"\n⚡ Processando {len(futures)} unidade(s) em {workers} processos")
+
+        try:
+            for cat_folder, cat_id, units in plan:
+                if units is None:
+                    print(f"\n▶️  {cat_folder}: Pasta não existe")
+                    continue
+                print(f"\n▶️  Processando: input/{cat_folder}")
+                for unit, sig, records in units:
+                    if records is not None:
+                        for record in records:
+                            print(f"   ♻️  {record['title']}: sem mudanças (ID: {record['id']})")
+                    else:
+                        if unit[0] in futures:
+                            records, log, metrics = futures[unit[0]].result()
+                            print(log, end='')
+                            REPORT.merge(metrics)
+                        else:
+                            records = _process_unit(unit, cat_folder, cat_id)
+                        manifest.put(unit[0], sig, records)
+                    output[cat_id].extend(records)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        manifest.save()
+    count('manifest.hits', manifest.hits)
+    count('manifest.misses', manifest.misses)
+    print(f"\n♻️  Manifesto: {manifest.hits} unidade(s) reaproveitada(s), {manifest.misses} reprocessada(s)")
+
+    reused = carry_forward_metadata(output, previous)
+    print(f"♻️  Metadados TMDB herdados do data.json anterior: {reused} itens")
+
+    print(f"\n✅ Catálogo montado")
     print(f"   📺 TV: {len(output.get('tv', []))} canais")
     print(f"   🎬 Filmes: {len(output.get('filmes', []))}")
     print(f"   📺 Séries: {len(output.get('series', []))}")
 
-    # Enriquecer com TMDB (só itens sem overview já)
+    # Enriquecer com TMDB (só itens ainda não consultados)
     items_sem_meta = [
-        i for cat in ['filmes','series','novelas','animes','infantil']
-        for i in output.get(cat, []) if not i.get('overview')
+        i for cat in VOD_CATEGORIES
+        for i in output.get(cat, []) if _tmdb_pending(i)
     ]
     if items_sem_meta:
-        enrich_with_tmdb(output)
+        with stage('tmdb'):
+            enrich_with_tmdb(output)
 
     # Enriquecer episódios com schedule para títulos configurados
-    enrich_episode_schedule(output)
+    with stage('episode_schedule'):
+        enrich_episode_schedule(output)
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    print(f"\n✅ JSON final salvo com metadados TMDB")
+    with stage('emit.data_json'):
+        catalog = catalog_for_schema(output, legacy)
+        write_json(json_path, catalog, pretty)
+    print(f"\n✅ JSON final salvo com metadados TMDB: {json_path} "
+          f"(esquema v{1 if legacy else SCHEMA_VERSION})")
+    with stage('emit.catalog_shards'):
+        write_catalog_shards(catalog, web_dir, pretty)
+    del catalog
 
-    generate_html_with_correct_paths(base_dir, output)
+    with stage('emit.html'):
+        generate_html_with_correct_paths(base_dir, output)
 
     output_dir = base_dir / "iptv_playlists"
     output_dir.mkdir(exist_ok=True)
-    generate_m3u_with_grouping(output, output_dir)
-    generate_epg(output, output_dir)
+    with stage('emit.m3u'):
+        generate_m3u_with_grouping(output, output_dir)
+    # No modo padrão o .gz do EPG sai junto com os outros artefatos, em precompress()
+    with stage('emit.epg'):
+        epg_file = Path(generate_epg(output, output_dir, horizon_hours=epg_hours, slot_minutes=epg_slot,
+                                     gzip_output=epg_gzip and pretty))
+    m3u_file = output_dir / "vod_grouped.m3u"
+    if pretty:
+        drop_precompressed(m3u_file)
+        drop_precompressed(epg_file, exts=('.br',) if epg_gzip else ('.gz', '.br'))
+    else:
+        with stage('emit.compress'):
+            for artefato in (m3u_file, epg_file):
+                report_sizes(artefato.name, precompress(artefato, emitted_changed(artefato)))
+    emit_summary(base_dir)
     print(f"\n🌐 Interface web atualizada")
     print(f"📍 Acesse: http://localhost:8000/web/")
 
@@ -602,6 +985,225 @@ def _load_tmdb_map() -> dict:
 
 TMDB_MAP = _load_tmdb_map()
 
+VOD_CATEGORIES = ['filmes', 'series', 'novelas', 'animes', 'infantil']
+
+# =========================
+# CLIENTE HTTP TMDB
+# Rate limit compartilhado entre threads + conexões keep-alive
+# =========================
+# Limite documentado do TMDB: 40 req / 10 s. Com burst B e taxa R, a pior janela de
+# 10 s vê B + 10·R requisições — 5 + 35 = 40, sem estourar o limite.
+TMDB_RATE_LIMIT  = 35
+TMDB_RATE_WINDOW = 10.0
+TMDB_RATE_BURST  = 5
+TMDB_WORKERS     = 8
+TMDB_MAX_RETRIES = 3
+
+
+class TokenBucket:
+    """Token bucket thread-safe: `rate` tokens a cada `per` segundos, acumulando até `burst`."""
+
+    def __init__(self, rate, per, burst):
+        self.fill_rate = rate / per
+        self.capacity  = burst
+        self.tokens    = float(burst)
+        self.updated   = time.monotonic()
+        self.lock      = threading.Lock()
+
+    def acquire(self):
+        """Bloqueia até haver um token disponível."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens  = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+
+TMDB_BUCKET = TokenBucket(TMDB_RATE_LIMIT, TMDB_RATE_WINDOW, TMDB_RATE_BURST)
+_tmdb_local = threading.local()
+
+# =========================
+# CACHE TMDB EM DISCO
+# =========================
+TMDB_CACHE_PATH = Path(__file__).parent / "cache" / "tmdb_cache.sqlite"
+# Validade (segundos) por tipo de endpoint — depois disso a resposta é revalidada
+TMDB_CACHE_TTL = {
+    'search':  30 * 86400,
+    'details':  7 * 86400,   # inclui credits e images (append_to_response)
+    'season':    6 * 3600,   # temporada no ar: capítulos novos e air_date ainda mudam
+    'season_ended': 30 * 86400,
+}
+# Temporada encerrada: todos os episódios com air_date, o último há mais de N dias
+SEASON_ENDED_DAYS = 14
+
+
+class TMDBCache:
+    """Cache SQLite de respostas TMDB, chave = endpoint + id/consulta + idioma.
+
+    Entradas vencidas (ou todas, com refresh=True) são revalidadas com
+    If-None-Match/If-Modified-Since; um 304 só renova a validade.
+    """
+
+    def __init__(self, path, refresh=False):
+        self.path        = path
+        self.refresh     = refresh
+        self.lock        = threading.Lock()
+        self.conn        = None
+        self.hits        = 0
+        self.revalidated = 0
+        self.fetched     = 0
+
+    def _db(self):
+        if self.conn is None:
+            self.path.parent.mkdir(exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' key TEXT PRIMARY KEY, body TEXT NOT NULL, etag TEXT, last_modified TEXT,'
+                ' fetched_at REAL NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS resolutions ('
+                ' media_type TEXT NOT NULL, query TEXT NOT NULL, tmdb_id INTEGER NOT NULL,'
+                ' PRIMARY KEY (media_type, query))'
+            )
+        return self.conn
+
+    def get(self, key):
+        """(body, etag, last_modified, expires_at) ou None."""
+        with self.lock:
+            return self._db().execute(
+                'SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+    def put(self, key, body, etag, last_modified, ttl):
+        now = time.time()
+        with self.lock:
+            self._db().execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                (key, body, etag, last_modified, now, now + ttl)
+            )
+
+    def touch(self, key, ttl):
+        now = time.time()
+        with self.lock:
+            self._db().execute(
+                'UPDATE responses SET fetched_at = ?, expires_at = ? WHERE key = ?', (now, now + ttl, key)
+            )
+
+    def get_resolution(self, media_type, query):
+        """tmdb_id já resolvido para esta busca, ou None (sempre None com refresh=True)."""
+        if self.refresh:
+            return None
+        with self.lock:
+            row = self._db().execute(
+                'SELECT tmdb_id FROM resolutions WHERE media_type = ? AND query = ?', (media_type, query)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_resolution(self, media_type, query, tmdb_id):
+        with self.lock:
+            self._db().execute(
+                'INSERT OR REPLACE INTO resolutions VALUES (?, ?, ?)', (media_type, query, tmdb_id)
+            )
+
+    def tally(self, field):
+        """Soma 1 em hits/revalidated/fetched sob o lock: tmdb_get roda nos threads do enrich."""
+        with self.lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def summary(self):
+        return (f"{self.hits} do cache, {self.revalidated} revalidada(s) (304), "
+                f"{self.fetched} baixada(s)")
+
+
+TMDB_CACHE = TMDBCache(TMDB_CACHE_PATH)
+
+def _tmdb_endpoint(path):
+    """Classifica o path da API para escolher o TTL do cache."""
+    if path.startswith('/search/'):
+        return 'search'
+    if '/season/' in path:
+        return 'season'
+    return 'details'
+
+def _season_ended(data):
+    dates = [ep.get('air_date') or '' for ep in data.get('episodes') or []]
+    if not dates or '' in dates:
+        return False
+    return max(dates) < (datetime.now() - timedelta(days=SEASON_ENDED_DAYS)).strftime('%Y-%m-%d')
+
+def _tmdb_ttl(path, data):
+    """Validade da resposta no cache; temporadas encerradas ficam bem mais tempo."""
+    kind = _tmdb_endpoint(path)
+    if kind == 'season' and _season_ended(data):
+        kind = 'season_ended'
+    return TMDB_CACHE_TTL[kind]
+
+def _tmdb_session():
+    """Uma requests.Session por thread: reaproveita a conexão HTTPS entre chamadas."""
+    session = getattr(_tmdb_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers['User-Agent'] = 'Pirataflix/1.0'
+        _tmdb_local.session = session
+    return session
+
+def tmdb_get(path, params=None, timeout=8):
+    """GET na API do TMDB (ex: '/tv/123') via cache em disco e rate limit. Devolve o JSON decodificado.
+    Em HTTP 429 espera o Retry-After e tenta de novo. Sem rede, usa a cópia vencida do cache
+    se existir; senão o erro sobe como exceção.
+    """
+    params = params or {}
+    key    = f"{path}?{urlencode(sorted(params.items()))}"
+    cached = TMDB_CACHE.get(key)
+    if cached and not TMDB_CACHE.refresh and cached[3] > time.time():
+        TMDB_CACHE.tally('hits')
+        count('tmdb.cache_hits')
+        return json.loads(cached[0])
+
+    headers = {}
+    if cached:
+        if cached[1]: headers['If-None-Match']     = cached[1]
+        if cached[2]: headers['If-Modified-Since'] = cached[2]
+    query = {'api_key': TMDB_API_KEY}
+    query.update(params)
+    try:
+        for attempt in range(TMDB_MAX_RETRIES + 1):
+            TMDB_BUCKET.acquire()
+            count('http.requests')
+            r = _tmdb_session().get(f"{TMDB_BASE}{path}", params=query, headers=headers, timeout=timeout)
+            if r.status_code == 429 and attempt < TMDB_MAX_RETRIES:
+                count('http.retries')
+                time.sleep(float(r.headers.get('Retry-After', 1)))
+                continue
+            break
+    except requests.RequestException:
+        count('http.errors')
+        if cached:
+            return json.loads(cached[0])
+        raise
+
+    if r.status_code == 304 and cached:
+        data = json.loads(cached[0])
+        TMDB_CACHE.touch(key, _tmdb_ttl(path, data))
+        TMDB_CACHE.tally('revalidated')
+        count('tmdb.revalidated')
+        return data
+    data = r.json()
+    if r.status_code == 200:
+        TMDB_CACHE.put(key, r.text, r.headers.get('ETag'), r.headers.get('Last-Modified'),
+                       _tmdb_ttl(path, data))
+        TMDB_CACHE.tally('fetched')
+        count('tmdb.fetched')
+    return data
+
 def _resolve_tmdb(title: str) -> dict | None:
     """Procura o título (slug, normalizado, com espaços) no TMDB_MAP."""
     import unicodedata as _ud
@@ -615,12 +1217,31 @@ def _resolve_tmdb(title: str) -> dict | None:
     return None
 
 
-def fetch_tmdb_metadata(title, media_type='movie'):
-    """Busca metadados do TMDB: poster, sinopse, ano, gêneros, nota.
-    Se tmdb_id estiver no mapeamento, busca diretamente pelo ID (resultado exato).
+def _search_tmdb_id(search_title, media_type):
+    """Resolve um título para tmdb_id via /search. A resolução fica memorizada no cache,
+    então nas próximas execuções o título vai direto para a busca por ID.
     """
-    import urllib.request, urllib.parse, time
+    tmdb_id = TMDB_CACHE.get_resolution(media_type, search_title)
+    if tmdb_id:
+        return tmdb_id
+    data    = tmdb_get(f"/search/{media_type}", {'query': search_title, 'language': 'pt-BR'})
+    results = data.get('results', [])
+    if not results:
+        data    = tmdb_get(f"/search/{media_type}", {'query': search_title})
+        results = data.get('results', [])
+    if not results or not results[0].get('id'):
+        return None
+    tmdb_id = results[0]['id']
+    TMDB_CACHE.put_resolution(media_type, search_title, tmdb_id)
+    return tmdb_id
 
+def fetch_tmdb_metadata(title, media_type='movie'):
+    """Busca metadados do TMDB: poster, sinopse, ano, gêneros, nota, elenco e capas.
+    Se tmdb_id estiver no mapeamento, busca diretamente pelo ID (resultado exato);
+    senão resolve o ID pela busca por texto. Detalhes, /credits e /images vêm numa
+    única requisição (append_to_response).
+    Devolve {} se o TMDB não tem o título e None se a consulta falhou (rede/API).
+    """
     mapped = _resolve_tmdb(title)
     if mapped:
         media_type = mapped.get('type', media_type)
@@ -628,34 +1249,23 @@ def fetch_tmdb_metadata(title, media_type='movie'):
     try:
         # ── Busca por ID direto (resultado garantido) ──────────────
         if mapped and mapped.get('tmdb_id'):
-            tmdb_id  = mapped['tmdb_id']
-            url_item = f"{TMDB_BASE}/{media_type}/{tmdb_id}?api_key={TMDB_API_KEY}&language=pt-BR"
-            req_item = urllib.request.Request(url_item, headers={'User-Agent': 'Pirataflix/1.0'})
-            with urllib.request.urlopen(req_item, timeout=8) as r:
-                item = json.loads(r.read())
-            if item.get('status_code'):  # erro da API
-                return {}
-        # ── Busca por texto ────────────────────────────────────────
+            tmdb_id = mapped['tmdb_id']
+        # ── Busca por texto (ID memorizado após a primeira vez) ────
         else:
             search_title = mapped['search'] if mapped and mapped.get('search') else title
-            query = urllib.parse.quote(search_title)
-            url   = f"{TMDB_BASE}/search/{media_type}?api_key={TMDB_API_KEY}&query={query}&language=pt-BR"
-            req   = urllib.request.Request(url, headers={'User-Agent': 'Pirataflix/1.0'})
-            with urllib.request.urlopen(req, timeout=8) as r:
-                data = json.loads(r.read())
-            results = data.get('results', [])
-            if not results:
-                url2 = f"{TMDB_BASE}/search/{media_type}?api_key={TMDB_API_KEY}&query={query}"
-                req2 = urllib.request.Request(url2, headers={'User-Agent': 'Pirataflix/1.0'})
-                with urllib.request.urlopen(req2, timeout=8) as r2:
-                    data = json.loads(r2.read())
-                results = data.get('results', [])
-            if not results:
+            tmdb_id = _search_tmdb_id(search_title, media_type)
+            if not tmdb_id:
                 return {}
-            item    = results[0]
-            tmdb_id = item.get('id', '')
 
-        tmdb_id = item.get('id', tmdb_id if mapped else '')
+        item = tmdb_get(f"/{media_type}/{tmdb_id}", {
+            'language':               'pt-BR',
+            'append_to_response':     'credits,images',
+            'include_image_language': 'pt,null,en',
+        })
+        if item.get('status_code'):  # erro da API (34 = ID inexistente)
+            return {} if item['status_code'] == 34 else None
+
+        tmdb_id = item.get('id', tmdb_id)
         poster  = (TMDB_IMG + item['poster_path']) if item.get('poster_path') else ''
         # Backdrop em alta resolução (w1280)
         backdrop = ('https://image.tmdb.org/t/p/w1280' + item['backdrop_path']) if item.get('backdrop_path') else ''
@@ -669,7 +1279,9 @@ def fetch_tmdb_metadata(title, media_type='movie'):
             10759:'Ação & Aventura',10762:'Kids',10763:'News',10764:'Realidade',
             10765:'Sci-Fi & Fantasia',10766:'Novela',10767:'Talk',10768:'Guerra & Política'
         }
-        for gid in item.get('genre_ids', [])[:3]:
+        # Detalhes trazem 'genres' [{id, name}]; resultados de busca trazem 'genre_ids'
+        genre_ids = item.get('genre_ids') or [g.get('id') for g in item.get('genres', [])]
+        for gid in genre_ids[:3]:
             if gid in genre_map:
                 genres.append(genre_map[gid])
         year_raw = item.get('release_date') or item.get('first_air_date') or ''
@@ -677,39 +1289,23 @@ def fetch_tmdb_metadata(title, media_type='movie'):
         overview = item.get('overview', '')
         vote     = item.get('vote_average', 0)
 
-        # Buscar elenco principal via /credits
+        # Elenco principal (credits anexado à resposta)
         cast = []
-        if tmdb_id:
-            try:
-                credits_url = f"{TMDB_BASE}/{media_type}/{tmdb_id}/credits?api_key={TMDB_API_KEY}&language=pt-BR"
-                req_c = urllib.request.Request(credits_url, headers={'User-Agent': 'Pirataflix/1.0'})
-                with urllib.request.urlopen(req_c, timeout=8) as rc:
-                    credits_data = json.loads(rc.read())
-                for actor in credits_data.get('cast', [])[:8]:
-                    profile = ('https://image.tmdb.org/t/p/w185' + actor['profile_path']) if actor.get('profile_path') else ''
-                    cast.append({
-                        'name':      actor.get('name', ''),
-                        'character': actor.get('character', ''),
-                        'profile':   profile
-                    })
-            except Exception:
-                pass
-
-        # Buscar múltiplas capas via /images
+        for actor in (item.get('credits') or {}).get('cast', [])[:8]:
+            profile = ('https://image.tmdb.org/t/p/w185' + actor['profile_path']) if actor.get('profile_path') else ''
+            cast.append({
+                'name':      actor.get('name', ''),
+                'character': actor.get('character', ''),
+                'profile':   profile
+            })
+
+        # Múltiplas capas (images anexado à resposta)
         posters = []
-        if tmdb_id:
-            try:
-                images_url = f"{TMDB_BASE}/{media_type}/{tmdb_id}/images?api_key={TMDB_API_KEY}&include_image_language=pt,null,en"
-                req_i = urllib.request.Request(images_url, headers={'User-Agent': 'Pirataflix/1.0'})
-                with urllib.request.urlopen(req_i, timeout=8) as ri:
-                    images_data = json.loads(ri.read())
-                for p in images_data.get('posters', [])[:6]:
-                    if p.get('file_path'):
-                        url_p = 'https://image.tmdb.org/t/p/w500' + p['file_path']
-                        if url_p not in posters:
-                            posters.append(url_p)
-            except Exception:
-                pass
+        for p in (item.get('images') or {}).get('posters', [])[:6]:
+            if p.get('file_path'):
+                url_p = 'https://image.tmdb.org/t/p/w500' + p['file_path']
+                if url_p not in posters:
+                    posters.append(url_p)
         # Garantir que o poster principal está na lista
         if poster and poster not in posters:
             posters.insert(0, poster)
@@ -726,40 +1322,102 @@ def fetch_tmdb_metadata(title, media_type='movie'):
             'cast':          cast
         }
     except Exception as e:
+        return None
+
+def _apply_tmdb_meta(item, meta):
+    """Copia os metadados TMDB para o item do catálogo (poster local vira local_poster)."""
+    if meta.get('tmdb_poster') and not item.get('poster','').startswith('http'):
+        item['local_poster'] = item['poster']
+        item['poster'] = meta['tmdb_poster']
+    elif meta.get('tmdb_poster') and item.get('poster','').startswith('http'):
+        item['tmdb_poster'] = meta['tmdb_poster']
+    if meta.get('posters'):    item['posters']  = meta['posters']
+    if meta.get('backdrop'):   item['backdrop'] = meta['backdrop']
+    if meta.get('overview'):   item['overview'] = meta['overview']
+    if meta.get('year'):       item['year']     = meta['year']
+    if meta.get('genres'):     item['genres']   = meta['genres']
+    if meta.get('rating'):     item['rating']   = meta['rating']
+    if meta.get('cast'):       item['cast']     = meta['cast']
+    if 'tmdb_id' in meta:      item['tmdb_id']  = meta['tmdb_id']
+
+def _meta_from_item(item):
+    """Reconstrói o dicionário de metadados TMDB a partir de um item já enriquecido."""
+    meta = {k: item[k] for k in ('posters', 'backdrop', 'overview', 'year', 'genres', 'rating', 'cast')
+            if item.get(k)}
+    if item.get('tmdb_poster'):
+        meta['tmdb_poster'] = item['tmdb_poster']
+    elif item.get('local_poster'):
+        meta['tmdb_poster'] = item.get('poster', '')
+    if 'tmdb_id' in item:
+        meta['tmdb_id'] = item['tmdb_id']
+    return meta
+
+def _tmdb_pending(item):
+    """True se o título ainda não passou pelo TMDB. tmdb_id marca a consulta feita
+    (None = não encontrado); overview cobre data.json de antes dessa marca."""
+    return 'tmdb_id' not in item and not item.get('overview')
+
+def load_previous_catalog(json_path):
+    """Lê o data.json do build anterior: {categoria: {id: item}} só com itens já consultados
+    no TMDB (encontrados, mesmo sem sinopse, ou marcados como não encontrados)."""
+    if not json_path.exists():
+        return {}
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except Exception as e:
+        print(f"   ⚠️  data.json anterior ilegível, TMDB completo: {e}")
         return {}
+    return {
+        cat: {i['id']: i for i in previous.get(cat, []) if i.get('id') and not _tmdb_pending(i)}
+        for cat in VOD_CATEGORIES
+    }
+
+def carry_forward_metadata(output, previous):
+    """Reaplica os metadados TMDB do build anterior (mesmo id/slug, mesma categoria).
+    Devolve quantos itens foram preenchidos — esses não vão mais ao TMDB.
+    Um "não encontrado" só é herdado se o título continua fora do tmdb_map.json.
+    """
+    reused = 0
+    for cat in VOD_CATEGORIES:
+        known = previous.get(cat, {})
+        for item in output.get(cat, []):
+            prev = known.get(item.get('id'))
+            if prev and prev.get('tmdb_id', 0) is None and _resolve_tmdb(item['title']):
+                continue
+            if prev:
+                _apply_tmdb_meta(item, _meta_from_item(prev))
+                reused += 1
+    return reused
 
 def enrich_with_tmdb(output):
-    """Enriquece filmes e séries com metadados do TMDB."""
-    import time
+    """Enriquece filmes e séries com metadados do TMDB (só itens ainda não consultados).
+    As buscas rodam em paralelo (TMDB_WORKERS threads, rate limit compartilhado);
+    os resultados são aplicados na ordem do catálogo.
+    """
     CATEGORY_TYPE = {
         'filmes': 'movie', 'series': 'tv', 'novelas': 'tv',
         'animes': 'tv', 'infantil': 'tv'
     }
-    total = sum(len(output.get(c, [])) for c in CATEGORY_TYPE)
+    jobs  = [(item, mtype) for cat, mtype in CATEGORY_TYPE.items()
+             for item in output.get(cat, []) if _tmdb_pending(item)]
+    total = len(jobs)
     done  = 0
     print(f"\n🎬 Buscando metadados TMDB para {total} itens...")
-    for cat, mtype in CATEGORY_TYPE.items():
-        for item in output.get(cat, []):
+    with ThreadPoolExecutor(max_workers=TMDB_WORKERS) as pool:
+        futures = [pool.submit(fetch_tmdb_metadata, item['title'], mtype) for item, mtype in jobs]
+        for (item, mtype), future in zip(jobs, futures):
             done += 1
-            meta = fetch_tmdb_metadata(item['title'], mtype)
+            meta = future.result()
             if meta:
-                if meta.get('tmdb_poster') and not item.get('poster','').startswith('http'):
-                    item['local_poster'] = item['poster']
-                    item['poster'] = meta['tmdb_poster']
-                elif meta.get('tmdb_poster') and item.get('poster','').startswith('http'):
-                    item['tmdb_poster'] = meta['tmdb_poster']
-                if meta.get('posters'):    item['posters']  = meta['posters']
-                if meta.get('backdrop'):   item['backdrop'] = meta['backdrop']
-                if meta.get('overview'):   item['overview'] = meta['overview']
-                if meta.get('year'):       item['year']     = meta['year']
-                if meta.get('genres'):     item['genres']   = meta['genres']
-                if meta.get('rating'):     item['rating']   = meta['rating']
-                if meta.get('cast'):       item['cast']     = meta['cast']
+                _apply_tmdb_meta(item, meta)
                 print(f"   ✅ [{done}/{total}] {item['title']} ({meta.get('year','')})")
+            elif meta is None:
+                print(f"   ⚠️  [{done}/{total}] {item['title']} — falha na consulta, tenta de novo no próximo build")
             else:
+                item['tmdb_id'] = None
                 print(f"   ⚠️  [{done}/{total}] {item['title']} — não encontrado no TMDB")
-            time.sleep(0.26)   # respeitar rate limit TMDB (40 req/10s)
-    print("✅ TMDB concluído!")
+    print(f"✅ TMDB concluído! Requisições: {TMDB_CACHE.summary()}")
 
 # =========================
 # AGENDA DE EPISÓDIOS (TMDB)
@@ -776,18 +1434,48 @@ EPISODE_SCHEDULE_TITLES = {
     }
 # Delay de liberação: servidor leva ~5h após meia-noite do air_date
 SCHEDULE_RELEASE_DELAY_HOURS = 21
+SCHEDULE_TZ = timezone(timedelta(hours=-3))
+
+def _schedule_now():
+    """Data/hora atual em Brasília (UTC-3), como comparada com a liberação dos episódios."""
+    return datetime.now(timezone.utc) - timedelta(hours=3)
+
+def schedule_release(air_date_str):
+    """Momento de liberação de um episódio (air_date + delay, em BRT) ou None sem air_date válido."""
+    if not air_date_str:
+        return None
+    try:
+        air_dt = datetime.strptime(air_date_str, '%Y-%m-%d')
+    except ValueError:
+        return None
+    return datetime(air_dt.year, air_dt.month, air_dt.day,
+                    tzinfo=SCHEDULE_TZ) + timedelta(hours=SCHEDULE_RELEASE_DELAY_HOURS)
+
+def apply_episode_lock(ep, now_br):
+    """Define locked/release_iso de um episódio a partir do air_date. Retorna True se mudou.
+
+    Episódio com URL fica liberado sem air_date e só leva release_iso enquanto bloqueado;
+    episódio ainda sem URL (futuro) fica bloqueado sem air_date e sempre leva release_iso.
+    """
+    release_dt  = schedule_release(ep.get('air_date', ''))
+    has_url     = bool(ep.get('url'))
+    locked      = (not has_url) if release_dt is None else now_br < release_dt
+    release_iso = (release_dt.strftime('%Y-%m-%dT%H:%M:%S')
+                   if release_dt and (locked or not has_url) else None)
+    before = (ep.get('locked'), ep.get('release_iso'))
+    ep['locked'] = locked
+    if release_iso:
+        ep['release_iso'] = release_iso
+    elif 'release_iso' in ep:
+        del ep['release_iso']
+    return before != (locked, release_iso)
 
 def fetch_episode_schedule(tmdb_id: int, season: int = 1) -> list[dict]:
     """Busca dados por episódio de uma temporada: air_date, overview, still, guest_stars."""
-    import urllib.request, json, time as _time
-    BASE = 'https://api.themoviedb.org/3'
     IMG  = 'https://image.tmdb.org/t/p/w400'
 
-    url = f"{BASE}/tv/{tmdb_id}/season/{season}?api_key={TMDB_API_KEY}&language=pt-BR"
     try:
-        req = urllib.request.Request(url, headers={'User-Agent': 'Pirataflix/1.0'})
-        with urllib.request.urlopen(req, timeout=10) as r:
-            data = json.loads(r.read())
+        data = tmdb_get(f"/tv/{tmdb_id}/season/{season}", {'language': 'pt-BR'}, timeout=10)
     except Exception as e:
         print(f"   ⚠️ Erro ao buscar schedule TMDB id={tmdb_id} s{season}: {e}")
         return []
@@ -806,120 +1494,192 @@ def fetch_episode_schedule(tmdb_id: int, season: int = 1) -> list[dict]:
             'still':       still,
             'guest_stars': guests,
         })
-        _time.sleep(0.05)
     return episodes
 
 def enrich_episode_schedule(output):
-    """Enriquece episódios de títulos configurados com schedule do TMDB."""
-    import time as _time
-    from datetime import datetime, timezone, timedelta
-
+    """Enriquece episódios de títulos configurados com schedule do TMDB.
+    As temporadas de todos os títulos são buscadas em paralelo (TMDB_WORKERS threads,
+    rate limit compartilhado pelo TMDB_BUCKET) e aplicadas na ordem do catálogo.
+    """
     if not TMDB_API_KEY or TMDB_API_KEY == 'SUA_CHAVE_AQUI':
         return
 
-    # Data/hora atual em Brasília (UTC-3)
-    now_br = datetime.now(timezone.utc) - timedelta(hours=3)
+    now_br = _schedule_now()
 
+    targets = []
     for category in ['novelas', 'series']:
         for item in output.get(category, []):
             item_slug = slugify(item.get('title', ''))
             tmdb_id   = EPISODE_SCHEDULE_TITLES.get(item_slug)
             if not tmdb_id:
                 continue
-
-            print(f"\n📅 Buscando agenda de episódios: {item['title']} (TMDB {tmdb_id})")
-
             # Determinar temporadas existentes
             seasons = item.get('seasons', [])
             if not seasons and item.get('episodes'):
-                seasons = [{'season': 1, 'episodes': item['episodes']}]
-
-            for season_obj in seasons:
-                season_num    = season_obj.get('season', 1)
-                season_eps    = season_obj.get('episodes', [])
-                tmdb_eps      = fetch_episode_schedule(tmdb_id, season_num)
-                tmdb_by_num   = {e['ep_number']: e for e in tmdb_eps}
-
-                enriched = []
-                for local_ep in season_eps:
-                    ep_num  = local_ep.get('episode', len(enriched) + 1)
-                    tmdb_ep = tmdb_by_num.get(ep_num, {})
-                    ep      = dict(local_ep)
-
-                    air_date_str = tmdb_ep.get('air_date', '')
-                    locked       = False
-                    release_dt   = None
-
-                    if air_date_str:
-                        try:
-                            air_dt     = datetime.strptime(air_date_str, '%Y-%m-%d')
-                            # Libera às 05:00 BRT do dia do air_date (00:00 + 5h do servidor)
-                            release_dt = datetime(
-                                air_dt.year, air_dt.month, air_dt.day,
-                                tzinfo=timezone(timedelta(hours=-3))
-                            ) + timedelta(hours=SCHEDULE_RELEASE_DELAY_HOURS)
-                            if now_br < release_dt:
-                                locked = True
-                        except Exception:
-                            pass
-
-                    ep['air_date']    = air_date_str
-                    ep['overview']    = tmdb_ep.get('overview', '')
-                    ep['still']       = tmdb_ep.get('still', '')
-                    ep['guest_stars'] = tmdb_ep.get('guest_stars', [])
-                    ep['locked']      = locked
-                    if locked and release_dt:
-                        ep['release_iso'] = release_dt.strftime('%Y-%m-%dT%H:%M:%S')
-                    enriched.append(ep)
-                    print(f"   {'🔒' if locked else '✅'} Ep {ep_num:03d} | {air_date_str} | {'BLOQUEADO' if locked else 'disponível'}")
-
-                # Inserir episódios futuros que ainda não têm URL no m3u
-                ep_nums_locais = {e.get('episode', 0) for e in season_eps}
-                for ep_num, tmdb_ep in sorted(tmdb_by_num.items()):
-                    if ep_num in ep_nums_locais:
-                        continue
-                    air_date_str = tmdb_ep.get('air_date', '')
-                    locked       = True
-                    release_dt   = None
-                    if air_date_str:
-                        try:
-                            air_dt     = datetime.strptime(air_date_str, '%Y-%m-%d')
-                            release_dt = datetime(
-                                air_dt.year, air_dt.month, air_dt.day,
-                                tzinfo=timezone(timedelta(hours=-3))
-                            ) + timedelta(hours=SCHEDULE_RELEASE_DELAY_HOURS)
-                            if now_br >= release_dt:
-                                locked = False  # deveria estar disponível mas não tem URL ainda
-                        except Exception:
-                            pass
-                    ep = {
-                        'title':       f'Capítulo {ep_num}',
-                        'url':         '',
-                        'episode':     ep_num,
-                        'air_date':    air_date_str,
-                        'overview':    tmdb_ep.get('overview', ''),
-                        'still':       tmdb_ep.get('still', ''),
-                        'guest_stars': tmdb_ep.get('guest_stars', []),
-                        'locked':      locked,
-                    }
-                    if release_dt:
-                        ep['release_iso'] = release_dt.strftime('%Y-%m-%dT%H:%M:%S')
-                    enriched.append(ep)
-                    print(f"   🔒 Ep {ep_num:03d} | {air_date_str} | SEM URL — futuro")
-
-                enriched.sort(key=lambda e: e.get('episode', 0))
-                season_obj['episodes'] = enriched
-
-            # Atualizar item.episodes se temporada única
-            if len(seasons) == 1:
+                seasons = [Season(season=1, episodes=item['episodes'])]
+            targets.append((item, tmdb_id, seasons))
+
+    keys = list(dict.fromkeys((tmdb_id, s.get('season', 1)) for _, tmdb_id, seasons in targets
+                              for s in seasons))
+    if keys:
+        print(f"\n📅 Buscando agenda de episódios: {len(targets)} título(s), {len(keys)} temporada(s)")
+    with ThreadPoolExecutor(max_workers=TMDB_WORKERS) as pool:
+        schedules = dict(zip(keys, pool.map(lambda k: fetch_episode_schedule(*k), keys)))
+
+    for item, tmdb_id, seasons in targets:
+        print(f"\n📅 Agenda de episódios: {item['title']} (TMDB {tmdb_id})")
+
+        for season_obj in seasons:
+            season_num    = season_obj.get('season', 1)
+            season_eps    = season_obj.get('episodes', [])
+            tmdb_eps      = schedules[(tmdb_id, season_num)]
+            tmdb_by_num   = {e['ep_number']: e for e in tmdb_eps}
+
+            enriched = []
+            for local_ep in season_eps:
+                ep_num  = local_ep.get('episode', len(enriched) + 1)
+                tmdb_ep = tmdb_by_num.get(ep_num, {})
+                ep      = Episode.from_dict(dict(local_ep))
+
+                air_date_str = tmdb_ep.get('air_date', '')
+                ep['air_date']    = air_date_str
+                ep['overview']    = tmdb_ep.get('overview', '')
+                ep['still']       = tmdb_ep.get('still', '')
+                ep['guest_stars'] = tmdb_ep.get('guest_stars', [])
+                apply_episode_lock(ep, now_br)
+                enriched.append(ep)
+                locked = ep['locked']
+                print(f"   {'🔒' if locked else '✅'} Ep {ep_num:03d} | {air_date_str} | {'BLOQUEADO' if locked else 'disponível'}")
+
+            # Inserir episódios futuros que ainda não têm URL no m3u
+            ep_nums_locais = {e.get('episode', 0) for e in season_eps}
+            for ep_num, tmdb_ep in sorted(tmdb_by_num.items()):
+                if ep_num in ep_nums_locais:
+                    continue
+                air_date_str = tmdb_ep.get('air_date', '')
+                ep = Episode(
+                    title       = f'Capítulo {ep_num}',
+                    url         = '',
+                    episode     = ep_num,
+                    air_date    = air_date_str,
+                    overview    = tmdb_ep.get('overview', ''),
+                    still       = tmdb_ep.get('still', ''),
+                    guest_stars = tmdb_ep.get('guest_stars', []),
+                )
+                # Sem URL: liberado só depois do air_date ("deveria estar disponível mas não tem URL ainda")
+                apply_episode_lock(ep, now_br)
+                enriched.append(ep)
+                print(f"   🔒 Ep {ep_num:03d} | {air_date_str} | SEM URL — futuro")
+
+            enriched.sort(key=lambda e: e.get('episode', 0))
+            season_obj['episodes'] = enriched
+
+        # Atualizar item.episodes se temporada única
+        if len(seasons) == 1:
+            item['episodes'] = seasons[0]['episodes']
+        item['has_schedule'] = True
+
+    print(f"✅ Agenda de episódios concluída! Requisições TMDB: {TMDB_CACHE.summary()}")
+
+# --refresh-locks roda de hora em hora: brotli rápido (~0.004s no data.json contra
+# ~0.03s da qualidade padrão, .br ~20% maior); o próximo build completo recomprime.
+REFRESH_BROTLI_QUALITY = 1
+
+def refresh_episode_locks(base_dir, pretty=False):
+    """--refresh-locks: recalcula locked/release_iso dos títulos de EPISODE_SCHEDULE_TITLES
+    contra a hora atual, usando os air_date já gravados no data.json (sem rede, sem parse).
+    Só data.json e os shards dos títulos que mudaram são regravados.
+    """
+    web_dir   = base_dir / "web"
+    json_path = web_dir / "data.json"
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ data.json indisponível ({e}). Execute antes: python3 build.py")
+        return 0
+
+    now_br  = _schedule_now()
+    changed = []
+    n_eps   = 0
+    for category in ['novelas', 'series']:
+        for item in data.get(category, []):
+            if slugify(item.get('title', '')) not in EPISODE_SCHEDULE_TITLES:
+                continue
+            seasons = item.get('seasons') or [{'episodes': item.get('episodes') or []}]
+            n = sum(apply_episode_lock(ep, now_br) for s in seasons for ep in s.get('episodes') or [])
+            # Esquema v1: item.episodes é uma cópia da temporada única
+            if len(seasons) == 1 and item.get('seasons') and 'episodes' in item:
                 item['episodes'] = seasons[0]['episodes']
-            item['has_schedule'] = True
-            _time.sleep(0.3)
+            if n:
+                changed.append((category, item))
+                n_eps += n
+                print(f"   🔄 {item['title']}: {n} episódio(s) com bloqueio alterado")
 
-    print("✅ Agenda de episódios concluída!")
+    if not changed:
+        print("✅ Bloqueios em dia — data.json sem mudanças")
+        return 0
+    write_json(json_path, data, pretty, quality=REFRESH_BROTLI_QUALITY)
+    update_catalog_files(web_dir, changed, pretty, quality=REFRESH_BROTLI_QUALITY)
+    print(f"🔓 {n_eps} episódio(s) em {len(changed)} título(s) atualizados")
+    emit_summary(base_dir)
+    return n_eps
 
 
 
+PWA_ICON_SIZES = [72, 96, 128, 144, 152, 192, 384, 512]
+ICON_STAMP     = ".stamp.json"   # dentro de web/icons/: hash do favicon + tamanhos já renderizados
+ICON_VERSION   = 2               # mudar se o desenho dos ícones mudar
+
+def _render_icons(favicon_path, sizes):
+    """Renderiza os ícones PWA → {tamanho: bytes PNG}.
+
+    Só o maior tamanho sai do favicon original; os demais são reduções dele,
+    feitas em paralelo (o resize do Pillow libera o GIL).
+    """
+    from PIL import Image
+    largest = max(sizes)
+    base = Image.new("RGBA", (largest, largest), (20, 20, 20, 255))
+    if favicon_path.exists():
+        icon = Image.open(favicon_path).convert("RGBA")
+        icon = icon.resize((int(largest * 0.7), int(largest * 0.7)), Image.LANCZOS)
+        base.paste(icon, ((largest - icon.width) // 2, (largest - icon.height) // 2), icon)
+
+    def render(size):
+        img = base if size == largest else base.resize((size, size), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, "PNG")
+        return size, buf.getvalue()
+
+    with ThreadPoolExecutor(max_workers=min(len(sizes), os.cpu_count() or 1)) as pool:
+        return dict(pool.map(render, sizes))
+
+def generate_pwa_icons(web_dir, sizes=PWA_ICON_SIZES):
+    """Gera web/icons/icon-<n>.png; pula tudo se favicon e tamanhos não mudaram."""
+    icons_dir    = web_dir / "icons"
+    favicon_path = web_dir / "favicon.png"
+    stamp_path   = icons_dir / ICON_STAMP
+    h = hashlib.sha1(f"v{ICON_VERSION}:{sorted(sizes)}".encode())
+    if favicon_path.exists():
+        h.update(favicon_path.read_bytes())
+    key = h.hexdigest()
+    try:
+        stamp = json.loads(stamp_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        stamp = {}
+    if stamp.get("key") == key and all((icons_dir / f"icon-{s}.png").exists() for s in sizes):
+        print(f"♻️  PWA ícones em cache: {icons_dir}")
+        return
+    try:
+        rendered = _render_icons(favicon_path, sizes)
+    except ImportError:
+        print("⚠️  Pillow não instalado — ícones PWA não gerados. Execute: pip install Pillow")
+        return
+    for size, png in rendered.items():
+        write_if_changed(icons_dir / f"icon-{size}.png", png)
+    write_if_changed(stamp_path, json.dumps({"key": key, "sizes": sorted(sizes)}))
+    print(f"✅ PWA ícones gerados: {icons_dir}")
+
 def generate_pwa_files(web_dir):
     """Gera manifest.json, sw.js e ícones PWA na pasta web/"""
     import json as _json
@@ -936,12 +1696,11 @@ def generate_pwa_files(web_dir):
         "orientation": "any",
         "icons": [
             {"src": f"icons/icon-{s}.png", "sizes": f"{s}x{s}", "type": "image/png", "purpose": "any maskable"}
-            for s in [72, 96, 128, 144, 152, 192, 384, 512]
+            for s in PWA_ICON_SIZES
         ]
     }
     manifest_path = web_dir / "manifest.json"
-    with open(manifest_path, "w", encoding="utf-8") as f:
-        _json.dump(manifest, f, ensure_ascii=False, indent=2)
+    write_if_changed(manifest_path, _json.dumps(manifest, ensure_ascii=False, indent=2))
     print(f"✅ PWA manifest gerado: {manifest_path}")
 
     # --- sw.js ---
@@ -950,7 +1709,7 @@ const ASSETS = [
   './', './index.html', './filmes.html', './series.html', './novelas.html',
   './animes.html', './infantil.html', './tv.html',
   './style.css', './tv-player.css', './shared.js', './tv-player.js',
-  './novo-player.js', './data.json', './channels.json',
+  './novo-player.js', './data.json', './catalog-index.json', './tv.json', './channels.json',
   './favicon.png', './manifest.json'
 ];
 self.addEventListener('install', e => {
@@ -977,27 +1736,11 @@ self.addEventListener('fetch', e => {
 });
 """
     sw_path = web_dir / "sw.js"
-    with open(sw_path, "w", encoding="utf-8") as f:
-        f.write(sw_content)
+    write_if_changed(sw_path, sw_content)
     print(f"✅ PWA service worker gerado: {sw_path}")
 
     # --- icons/ ---
-    icons_dir = web_dir / "icons"
-    icons_dir.mkdir(exist_ok=True)
-    favicon_path = web_dir / "favicon.png"
-    try:
-        from PIL import Image
-        base_img = Image.open(favicon_path).convert("RGBA") if favicon_path.exists() else None
-        for size in [72, 96, 128, 144, 152, 192, 384, 512]:
-            img = Image.new("RGBA", (size, size), (20, 20, 20, 255))
-            if base_img:
-                icon = base_img.resize((int(size * 0.7), int(size * 0.7)), Image.LANCZOS)
-                offset = ((size - icon.width) // 2, (size - icon.height) // 2)
-                img.paste(icon, offset, icon)
-            img.save(icons_dir / f"icon-{size}.png", "PNG")
-        print(f"✅ PWA ícones gerados: {icons_dir}")
-    except ImportError:
-        print("⚠️  Pillow não instalado — ícones PWA não gerados. Execute: pip install Pillow")
+    generate_pwa_icons(web_dir)
 
 
 def generate_html_with_correct_paths(base_dir, data):
@@ -1023,9 +1766,9 @@ def generate_html_with_correct_paths(base_dir, data):
 
     channels_js_path = base_dir / "web" / "channels-dict.js"
     channels_json = json.dumps(channels_dict, ensure_ascii=False)
-    with open(channels_js_path, "w", encoding="utf-8") as f:
-        f.write("// Gerado automaticamente pelo build.py - nao edite manualmente\n")
-        f.write(f"window.channelsDict = {channels_json};\n")
+    write_if_changed(channels_js_path,
+                     "// Gerado automaticamente pelo build.py - nao edite manualmente\n"
+                     f"window.channelsDict = {channels_json};\n")
     print(f"✅ channels-dict.js gerado: {len(channels_dict)} entradas")
 
     # Garantir que index.html estático existe (não sobrescrever)
@@ -1042,4 +1785,52 @@ def generate_html_with_correct_paths(base_dir, data):
 
 
 if __name__ == '__main__':
-    build_vod_with_direct_capas()
+    import argparse
+
+    def inteiro_positivo(valor):
+        try:
+            n = int(valor)
+        except ValueError:
+            n = 0
+        if n <= 0:
+            raise argparse.ArgumentTypeError(f'esperado inteiro positivo, recebido {valor!r}')
+        return n
+
+    parser = argparse.ArgumentParser(description='Gera data.json, playlists M3U e EPG do Pirataflix')
+    parser.add_argument('--full', action='store_true',
+                        help='ignora cache/build_manifest.json e reprocessa todos os .m3u')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='processos para o parse das pastas (0 = todos os núcleos)')
+    parser.add_argument('--refresh-tmdb', action='store_true',
+                        help='revalida todo o cache TMDB e não herda metadados do data.json anterior')
+    parser.add_argument('--epg-hours', type=inteiro_positivo, default=EPG_HORIZON_HOURS, metavar='H',
+                        help=f'horizonte da programação do EPG em horas (padrão {EPG_HORIZON_HOURS})')
+    parser.add_argument('--epg-slot', type=inteiro_positivo, default=EPG_SLOT_MINUTES, metavar='MIN',
+                        help=f'duração de cada slot do EPG em minutos (padrão {EPG_SLOT_MINUTES})')
+    parser.add_argument('--epg-gzip', action='store_true',
+                        help='com --pretty, grava também iptv_playlists/epg.xml.gz '
+                             '(sem --pretty o .gz já sai sempre, com os outros artefatos)')
+    parser.add_argument('--pretty', action='store_true',
+                        help=f'data.json indentado e sem .gz/.br (debug; ou {PRETTY_ENV}=1)')
+    parser.add_argument('--legacy-schema', action='store_true',
+                        help=f'data.json no esquema v1, com os episódios repetidos em item.episodes '
+                             f'(ou {LEGACY_SCHEMA_ENV}=1)')
+    parser.add_argument('--refresh-locks', action='store_true',
+                        help='só recalcula locked/release_iso dos episódios com agenda no data.json '
+                             '(sem rede; não roda o build)')
+    parser.add_argument('--profile', action='store_true',
+                        help='roda sob cProfile e grava cache/build.prof')
+    args = parser.parse_args()
+    if args.epg_gzip and not pretty_output(args.pretty):
+        parser.error('--epg-gzip só vale com --pretty: no modo padrão o epg.xml.gz já é gerado')
+    if args.refresh_locks:
+        refresh_episode_locks(Path(__file__).parent, pretty=pretty_output(args.pretty))
+    else:
+        TMDB_CACHE.refresh = args.refresh_tmdb
+        with profiled(args.profile, REPORT_PATH.with_name('build.prof')):
+            build_vod_with_direct_capas(full_rebuild=args.full, jobs=args.jobs or os.cpu_count() or 1,
+                                        refresh_tmdb=args.refresh_tmdb, epg_hours=args.epg_hours,
+                                        epg_slot=args.epg_slot, epg_gzip=args.epg_gzip,
+                                        pretty=pretty_output(args.pretty),
+                                        legacy=legacy_schema(args.legacy_schema))
+        REPORT.save('build')
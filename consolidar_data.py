@@ -8,7 +8,7 @@ VERSÃO CORRIGIDA - Força a inclusão de canais de TV
 import json
 import re
 from pathlib import Path
-from utils import normalize_tv_group
+from utils import normalize_tv_group, write_json, pretty_output, PRETTY_ENV
 
 print("=" * 60)
 print("🔄 CONSOLIDANDO DADOS NO DATA.JSON")
@@ -118,7 +118,7 @@ def carregar_json(path: Path) -> list | dict:
     
     return '📺 Geral'
 
-def consolidate():
+def consolidate(pretty: bool = False):
     base_dir = Path(__file__).parent
     web_dir = base_dir / 'web'
     data_json = web_dir / 'data.json'
@@ -131,8 +131,10 @@ def consolidate():
     if not isinstance(data_antigo, dict):
         data_antigo = {}
 
-    # Inicializar estrutura
+    # Inicializar estrutura (a versão do esquema gravada pelo build.py é mantida)
     data = {}
+    if 'schema_version' in data_antigo:
+        data['schema_version'] = data_antigo['schema_version']
     for cat in CATS_VOD:
         data[cat] = data_antigo.get(cat, [])
     
@@ -200,10 +202,7 @@ def consolidate():
 
     # Salvar
     try:
-        data_json.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            encoding='utf-8'
-        )
+        write_json(data_json, data, pretty)
         
         total_itens = sum(len(data.get(c, [])) for c in CATS_VOD)
         total_itens += len(data.get(TV_LEGACY_KEY, []))
@@ -216,4 +215,8 @@ def consolidate():
         print(f"\n❌ Erro ao salvar data.json: {e}")
 
 if __name__ == '__main__':
-    consolidate()
+    import argparse
+    parser = argparse.ArgumentParser(description='Consolida VOD e canais de TV no data.json')
+    parser.add_argument('--pretty', action='store_true',
+                        help=f'data.json indentado e sem .gz/.br (debug; ou {PRETTY_ENV}=1)')
+    consolidate(pretty=pretty_output(parser.parse_args().pretty))
@@ -4,14 +4,21 @@
 download_iptv.py — Baixa listas IPTV brasileiras e separa por categorias
 """
 
+import argparse
+import hashlib
 import requests
 import json
 import re
 import os
 import shutil
+import sqlite3
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from utils import normalize_tv_group
+from functools import lru_cache
+from utils import (normalize_tv_group, iter_m3u, dumps_json, precompress, drop_precompressed,
+                   report_sizes, pretty_output, PRETTY_ENV, write_if_changed, atomic_open,
+                   emit_summary, REPORT, REPORT_PATH, stage, count, profiled, Channel)
 
 print("=" * 60)
 print("🚀 DOWNLOAD IPTV — CATEGORIAS SEPARADAS")
@@ -35,6 +42,22 @@ FONTES = [
     },
 ]
 
+# =============================================================
+# PALAVRAS-CHAVE DO FILTRO BRASILEIRO
+# Usadas nas fontes que não são só do Brasil. Edite filtro_br.json na raiz:
+# "incluir" (KW_BR) e "excluir" (KW_EXCL, com prioridade), em minúsculas.
+# =============================================================
+FILTRO_BR_PATH = Path(__file__).parent / 'filtro_br.json'
+
+
+def carregar_palavras(path: Path = FILTRO_BR_PATH) -> tuple[list[str], list[str]]:
+    """(incluir, excluir) do filtro_br.json. Sem esse arquivo o filtro não faz sentido: o erro sobe."""
+    dados = json.loads(path.read_text(encoding='utf-8'))
+    return [p.lower() for p in dados['incluir']], [p.lower() for p in dados['excluir']]
+
+
+KW_BR, KW_EXCL = carregar_palavras()
+
 # =============================================================
 # MAPEAMENTO DE GRUPOS → CATEGORIAS PT-BR
 # =============================================================
@@ -49,91 +72,133 @@ def testar_conexao():
         return False
 
 
-def baixar_fonte(url: str, destino: Path, nome: str) -> str | None:
-    print(f"\n📡 Baixando: {nome}")
-    print(f"   URL: {url}")
-    try:
-        r = requests.get(url, timeout=45, headers={'User-Agent': 'Mozilla/5.0'})
-        if r.status_code == 200:
-            destino.write_text(r.text, encoding='utf-8')
-            linhas = r.text.count('\n')
-            print(f"   ✅ OK — {len(r.text)//1024} KB, ~{linhas} linhas")
-            return r.text
-        else:
-            print(f"   ❌ HTTP {r.status_code}")
-            return None
-    except Exception as e:
-        print(f"   ❌ Erro: {e}")
-        return None
+def _meta_path(destino: Path) -> Path:
+    """Sidecar com ETag/Last-Modified/sha256 da fonte: <arquivo>.m3u.meta.json"""
+    return destino.with_name(destino.name + '.meta.json')
 
 
-def parse_m3u(conteudo: str) -> list[dict]:
-    """Extrai canais de um conteúdo M3U."""
+def carregar_meta(destino: Path) -> dict:
+    try:
+        return json.loads(_meta_path(destino).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def salvar_meta(destino: Path, meta: dict):
+    write_if_changed(_meta_path(destino), json.dumps(meta, ensure_ascii=False, indent=2))
+
+
+def baixar_fonte(session: requests.Session, fonte: dict, destino: Path) -> tuple[str, dict, list[str]]:
+    """Baixa uma fonte com GET condicional.
+
+    Retorna (estado, meta, log):
+    - estado: 'novo' (conteúdo mudou), 'igual' (304 ou mesmo sha256) ou 'erro'
+    - meta: ETag/Last-Modified/sha256 a gravar depois que o processamento terminar
+    - log: mensagens, impressas na ordem de FONTES (downloads rodam em paralelo)
+    """
+    log = [f"\n📡 Baixando: {fonte['nome']}", f"   URL: {fonte['url']}"]
+    meta = carregar_meta(destino) if destino.exists() else {}
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    count('http.requests')
+    try:
+        r = session.get(fonte['url'], timeout=45, headers=headers)
+    except Exception as e:
+        count('http.errors')
+        log.append(f"   ❌ Erro: {e}")
+        return 'erro', meta, log
+    count('bytes_downloaded', len(r.content))
+
+    if r.status_code == 304:
+        count('http.not_modified')
+        log.append("   ♻️ Sem mudanças (304)")
+        return 'igual', meta, log
+    if r.status_code != 200:
+        log.append(f"   ❌ HTTP {r.status_code}")
+        return 'erro', meta, log
+
+    novo_meta = {
+        'url':           fonte['url'],
+        'etag':          r.headers.get('ETag'),
+        'last_modified': r.headers.get('Last-Modified'),
+        'sha256':        hashlib.sha256(r.content).hexdigest(),
+    }
+    if novo_meta['sha256'] == meta.get('sha256'):
+        log.append("   ♻️ Sem mudanças (mesmo conteúdo)")
+        return 'igual', novo_meta, log
+
+    write_if_changed(destino, r.text)
+    linhas = r.text.count('\n')
+    log.append(f"   ✅ OK — {len(r.text)//1024} KB, ~{linhas} linhas")
+    return 'novo', novo_meta, log
+
+
+def parse_m3u(fonte) -> list[Channel]:
+    """Extrai canais de um M3U (caminho ou iterável de linhas, ver utils.iter_m3u)."""
     canais = []
-    linhas = conteudo.splitlines()
-    i = 0
-    while i < len(linhas):
-        linha = linhas[i].strip()
-        if linha.startswith('#EXTINF:'):
-            info = linha[8:]
-
-            tvg_id    = re.search(r'tvg-id="([^"]*)"',    info)
-            tvg_logo  = re.search(r'tvg-logo="([^"]*)"',  info)
-            group     = re.search(r'group-title="([^"]*)"', info)
-            tvg_name  = re.search(r'tvg-name="([^"]*)"',  info)
-
-            partes = info.split(',', 1)
-            titulo = partes[1].strip() if len(partes) > 1 else 'Sem nome'
-
-            i += 1
-            # Pular linhas de comentário intermediárias
-            while i < len(linhas) and linhas[i].strip().startswith('#'):
-                i += 1
-
-            if i < len(linhas):
-                url_canal = linhas[i].strip()
-                if url_canal and not url_canal.startswith('#'):
-                    canais.append({
-                        'title':     titulo,
-                        'url':       url_canal,
-                        'tvg_id':    tvg_id.group(1)   if tvg_id   else '',
-                        'tvg_logo':  tvg_logo.group(1) if tvg_logo else '',
-                        'tvg_name':  tvg_name.group(1) if tvg_name else titulo,
-                        'group_raw': group.group(1)    if group    else '',
-                    })
-        i += 1
+    for entrada in iter_m3u(fonte):
+        titulo = entrada.title or 'Sem nome'
+        attrs  = entrada.attrs
+        canais.append(Channel(
+            title     = titulo,
+            url       = entrada.url,
+            tvg_id    = attrs.get('tvg-id', ''),
+            tvg_logo  = attrs.get('tvg-logo', ''),
+            tvg_name  = attrs.get('tvg-name', titulo),
+            group_raw = attrs.get('group-title', ''),
+        ))
     return canais
 
 
-def filtrar_brasileiros(canais: list[dict]) -> list[dict]:
-    """Filtra canais com indicação brasileira."""
-    KW_BR = [
-        'globo','sbt','record','band','redetv','cultura','tv brasil',
-        'cnn brasil','globo news','sportv','tnt brasil','fox brasil',
-        'universal','futura','telecine','premiere','combate','discovery',
-        'history','a&e','sony','warner','max ','hbo','multishow','viva',
-        'gnt','bis','off ','cartoon','nick ','disney','espn','band sports',
-        'canção nova','aparecida','tv senado','tv câmara','tv justiça',
-        'brazil','brasil','br:','br |','hd br','sd br', '.br',
-        'megapix','woohoo','mtv','paramount','pluto',
-    ]
-    KW_EXCL = [
-        'usa ','united states',' uk ','united kingdom','deutsch',
-        'germany','france','italia',' spain ','mexico ','argentina ',
-        'colombia','peru ','chile ','portugal ','english','español',
-        'french','italian','turkish','arabic','hindi','chinese',
-    ]
+def _regex_trie(palavras: list[str]) -> str:
+    """Alternação com prefixos fatorados ('band', 'band sports' → 'band(?: sports)?')."""
+    trie: dict = {}
+    for palavra in palavras:
+        no = trie
+        for ch in palavra:
+            no = no.setdefault(ch, {})
+        no[''] = {}
+
+    def montar(no: dict) -> str:
+        ramos = [re.escape(ch) + montar(no[ch]) for ch in sorted(k for k in no if k)]
+        if not ramos:
+            return ''
+        corpo = ramos[0] if len(ramos) == 1 else '(?:' + '|'.join(ramos) + ')'
+        return f'(?:{corpo})?' if '' in no else corpo
+
+    return montar(trie) if trie else '(?!)'
+
+
+@lru_cache(maxsize=8)
+def _compilar_filtro(kw_br: tuple, kw_excl: tuple) -> tuple[re.Pattern, re.Pattern]:
+    return re.compile(_regex_trie(list(kw_br))), re.compile(_regex_trie(list(kw_excl)))
+
+
+def filtrar_brasileiros(canais: list[Channel], kw_br: list[str] = KW_BR,
+                        kw_excl: list[str] = KW_EXCL) -> list[Channel]:
+    """Filtra canais com indicação brasileira (uma regex por lista, compilada uma vez).
+
+    Duas buscas de propósito: numa regex única com as duas listas, um termo de
+    "incluir" pode consumir o trecho onde começa um de "excluir", e a versão com
+    lookahead (que evita isso) testa toda posição do texto e mede mais lenta —
+    ver benchmarks/bench_filtro_br.py.
+    """
+    re_br, re_excl = _compilar_filtro(tuple(kw_br), tuple(kw_excl))
+    tem_br, tem_excl = re_br.search, re_excl.search
     resultado = []
     for c in canais:
         texto = f"{c['title']} {c['tvg_id']} {c['group_raw']}".lower()
-        if any(x in texto for x in KW_EXCL):
+        if tem_excl(texto):
             continue
-        if any(x in texto for x in KW_BR) or '.br' in c['tvg_id'].lower():
+        if tem_br(texto) or '.br' in c['tvg_id'].lower():
             resultado.append(c)
     return resultado
 
 
-def salvar_por_categoria(canais: list[dict], pasta_tv: Path):
+def salvar_por_categoria(canais: list[Channel], pasta_tv: Path):
     """Salva um .m3u por categoria dentro de input_auto/TV/."""
     # Agrupar
     por_cat: dict[str, list] = {}
@@ -141,68 +206,185 @@ def salvar_por_categoria(canais: list[dict], pasta_tv: Path):
         cat = normalize_tv_group(c['group_raw'])
         por_cat.setdefault(cat, []).append(c)
 
-    # Limpar arquivos antigos de categoria
-    for f in pasta_tv.glob('cat_*.m3u'):
-        f.unlink()
-
     print(f"\n📁 Salvando {len(por_cat)} categorias em {pasta_tv}:")
+    gravados = set()
     for cat, lista in sorted(por_cat.items()):
         # Nome de arquivo seguro
         slug = re.sub(r'[^\w]', '_', cat).strip('_').lower()
         slug = re.sub(r'_+', '_', slug)
         arquivo = pasta_tv / f"cat_{slug}.m3u"
-        with open(arquivo, 'w', encoding='utf-8') as f:
+        gravados.add(arquivo.name)
+        with atomic_open(arquivo, 'w', encoding='utf-8') as f:
             f.write('#EXTM3U\n')
             for c in lista:
                 f.write(f'#EXTINF:-1 tvg-id="{c["tvg_id"]}" tvg-logo="{c["tvg_logo"]}" group-title="{cat}",{c["title"]}\n')
                 f.write(f'{c["url"]}\n\n')
         print(f"   {cat}: {len(lista)} canais → {arquivo.name}")
 
+    # Remover só as categorias que deixaram de existir
+    for f in pasta_tv.glob('cat_*.m3u'):
+        if f.name not in gravados:
+            f.unlink()
+
     return por_cat
 
 
-def criar_channels_json(canais: list[dict], web_dir: Path):
+CHANNEL_STORE_PATH = Path(__file__).parent / 'cache' / 'channels.sqlite'
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+class ChannelStore:
+    """Canais de TV em SQLite, indexados pelo hash da URL.
+
+    - channels: um registro por canal, na ordem de inserção (pos)
+    - urls: toda URL conhecida (canal e episódios) → canal, para deduplicar em O(1)
+    - Inicializado a partir do channels.json; se o channels.json não for o último
+      exportado (ex: git reset, cache do CI antigo), é reimportado.
+    - export() só reescreve o channels.json (compacto) quando algo mudou.
+    """
+
+    def __init__(self, path: Path, channels_file: Path):
+        self.channels_file = channels_file
+        self.changed = False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(
+            'CREATE TABLE IF NOT EXISTS channels (key TEXT PRIMARY KEY, pos INTEGER, data TEXT);'
+            'CREATE TABLE IF NOT EXISTS urls (key TEXT PRIMARY KEY, channel TEXT);'
+            'CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);'
+        )
+        self._pos = self.db.execute('SELECT COALESCE(MAX(pos), 0) FROM channels').fetchone()[0]
+        atual = self._file_hash()
+        if atual != self._meta('exported_sha256'):
+            self._bootstrap(atual)
+
+    def _meta(self, name: str):
+        row = self.db.execute('SELECT value FROM meta WHERE name = ?', (name,)).fetchone()
+        return row[0] if row else None
+
+    def _file_hash(self):
+        if not self.channels_file.exists():
+            return None
+        return hashlib.sha256(self.channels_file.read_bytes()).hexdigest()
+
+    def _bootstrap(self, file_hash):
+        """Recria o índice a partir do channels.json atual."""
+        canais = []
+        if file_hash:
+            try:
+                canais = json.loads(self.channels_file.read_text(encoding='utf-8'))
+            except Exception as e:
+                print(f"   ⚠️ Erro ao ler channels.json: {e}")
+        with self.db:
+            self.db.execute('DELETE FROM channels')
+            self.db.execute('DELETE FROM urls')
+            self._pos = 0
+            for canal in canais:
+                self._insert(canal)
+            self.db.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', ('exported_sha256', file_hash))
+        print(f"   📥 Índice de canais recriado a partir do channels.json ({len(canais)} canais)")
+
+    def _insert(self, canal: dict) -> str:
+        key = _url_key(canal.get('url') or json.dumps(canal, sort_keys=True))
+        self._pos += 1
+        self.db.execute('INSERT OR IGNORE INTO channels VALUES (?, ?, ?)',
+                        (key, self._pos, dumps_json(canal)))
+        urls = [canal.get('url')] + [ep.get('url') for ep in canal.get('episodes', [])]
+        self.db.executemany('INSERT OR IGNORE INTO urls VALUES (?, ?)',
+                            [(_url_key(u), key) for u in urls if u])
+        return key
+
+    def __len__(self) -> int:
+        return self.db.execute('SELECT COUNT(*) FROM channels').fetchone()[0]
+
+    def __contains__(self, url: str) -> bool:
+        return self.db.execute('SELECT 1 FROM urls WHERE key = ?', (_url_key(url),)).fetchone() is not None
+
+    def upsert(self, canal: dict, substituir: bool = False) -> bool:
+        """Insere o canal se a URL for nova; com substituir=True atualiza no lugar.
+        Retorna True se algo mudou."""
+        row = self.db.execute('SELECT channel FROM urls WHERE key = ?', (_url_key(canal['url']),)).fetchone()
+        if row is None:
+            self._insert(canal)
+        elif substituir:
+            data = dumps_json(canal)
+            cur = self.db.execute('UPDATE channels SET data = ? WHERE key = ? AND data != ?', (data, row[0], data))
+            if not cur.rowcount:
+                return False
+        else:
+            return False
+        self.changed = True
+        return True
+
+    def export(self, pretty: bool = False):
+        """Grava o channels.json se houve mudança (ou se ele não existe / mudou o modo).
+
+        Padrão: minificado + .gz/.br. pretty: indentado, sem compressão (debug).
+        """
+        modo = 'pretty' if pretty else 'min'
+        if not self.changed and self.channels_file.exists() and self._meta('exported_mode') == modo:
+            self.db.commit()
+            return False
+        rows = [data for (data,) in self.db.execute('SELECT data FROM channels ORDER BY pos')]
+        if pretty:
+            conteudo = dumps_json([json.loads(data) for data in rows], pretty=True)
+        else:
+            conteudo = '[' + ','.join(rows) + ']'
+        conteudo = conteudo.encode('utf-8')
+        changed = write_if_changed(self.channels_file, conteudo)
+        if pretty:
+            drop_precompressed(self.channels_file)
+        else:
+            # Tamanho indentado só com --profile: custa uma serialização inteira a mais
+            pretty_size = (len(dumps_json([json.loads(data) for data in rows], pretty=True).encode('utf-8'))
+                           if REPORT.detailed else None)
+            report_sizes(self.channels_file.name, precompress(self.channels_file, changed), pretty_size)
+        self.db.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                            [('exported_sha256', hashlib.sha256(conteudo).hexdigest()),
+                             ('exported_mode', modo)])
+        self.db.commit()
+        self.changed = False
+        return True
+
+    def close(self):
+        self.db.close()
+
+
+def criar_channels_json(canais: list[Channel], web_dir: Path, pretty: bool = False):
     """Cria/atualiza channels.json sem duplicatas, com categoria PT-BR."""
-    channels_file = web_dir / 'channels.json'
-
-    # Carregar existentes
-    existentes: list[dict] = []
-    urls_existentes: set[str] = set()
-    if channels_file.exists():
-        try:
-            existentes = json.loads(channels_file.read_text(encoding='utf-8'))
-            for c in existentes:
-                if c.get('url'):       urls_existentes.add(c['url'])
-                for ep in c.get('episodes', []):
-                    if ep.get('url'): urls_existentes.add(ep['url'])
-        except Exception as e:
-            print(f"   ⚠️ Erro ao ler channels.json: {e}")
+    store = ChannelStore(CHANNEL_STORE_PATH, web_dir / 'channels.json')
 
     novos = 0
     for c in canais:
-        if c['url'] in urls_existentes:
+        if c['url'] in store:
             continue
         cat = normalize_tv_group(c['group_raw'])
         canal_id = c['tvg_id'] or re.sub(r'[^\w]', '_', c['title'].lower()).strip('_')
-        existentes.append({
-            'id':       canal_id,
-            'type':     'tv',
-            'title':    c['title'],
-            'tvg_id':   c['tvg_id'],
-            'tvg_logo': c['tvg_logo'],
-            'group':    cat,
-            'url':      c['url'],
-            'episodes': [{'url': c['url'], 'title': 'AO VIVO'}],
-        })
-        urls_existentes.add(c['url'])
+        store.upsert(Channel(
+            id       = canal_id,
+            type     = 'tv',
+            title    = c['title'],
+            tvg_id   = c['tvg_id'],
+            tvg_logo = c['tvg_logo'],
+            group    = cat,
+            url      = c['url'],
+            episodes = [{'url': c['url'], 'title': 'AO VIVO'}],
+        ))
         novos += 1
 
-    channels_file.write_text(json.dumps(existentes, ensure_ascii=False, indent=2), encoding='utf-8')
-    print(f"\n✅ channels.json: {novos} novos, {len(existentes)} total")
-    return existentes
+    total = len(store)
+    if store.export(pretty):
+        print(f"\n✅ channels.json: {novos} novos, {total} total")
+    else:
+        print(f"\n♻️ channels.json sem mudanças ({total} canais)")
+    store.close()
+    return novos
 
 
-def main():
+def main(forcar: bool = False, pretty: bool = False):
     if not testar_conexao():
         print("\n❌ Sem conexão. Abortando.")
         return
@@ -213,43 +395,67 @@ def main():
     pasta_tv.mkdir(parents=True, exist_ok=True)
     web_dir.mkdir(exist_ok=True)
 
-    todos_canais: list[dict] = []
+    # Todas as fontes em paralelo, com uma Session compartilhada (keep-alive)
+    session = requests.Session()
+    session.headers['User-Agent'] = 'Mozilla/5.0'
+    with stage('download'), ThreadPoolExecutor(max_workers=len(FONTES)) as pool:
+        resultados = list(pool.map(
+            lambda fonte: baixar_fonte(session, fonte, pasta_tv / fonte['arquivo']), FONTES))
+    for _, _, log in resultados:
+        print('\n'.join(log))
+
+    mudou = any(estado == 'novo' for estado, _, _ in resultados)
+    saidas_ok = (web_dir / 'channels.json').exists() and any(pasta_tv.glob('cat_*.m3u'))
+    if not mudou and saidas_ok and not forcar:
+        for fonte, (estado, meta, _) in zip(FONTES, resultados):
+            if estado == 'igual':
+                salvar_meta(pasta_tv / fonte['arquivo'], meta)
+        print("\n♻️ Nenhuma fonte mudou — parse, filtro e categorias mantidos")
+        print("=" * 60)
+        return
+
+    todos_canais: list[Channel] = []
 
-    for fonte in FONTES:
+    for fonte, (estado, _, _) in zip(FONTES, resultados):
         destino = pasta_tv / fonte['arquivo']
-        conteudo = baixar_fonte(fonte['url'], destino, fonte['nome'])
-        if not conteudo:
+        if not destino.exists():
+            continue
+        if estado == 'erro':
             # Tentar usar cache local
-            if destino.exists():
-                print(f"   ⚠️ Usando cache: {destino.name}")
-                conteudo = destino.read_text(encoding='utf-8', errors='ignore')
-            else:
-                continue
+            print(f"\n   ⚠️ Usando cache: {destino.name}")
 
-        canais = parse_m3u(conteudo)
-        print(f"   📊 {len(canais)} canais encontrados")
+        # Parse direto do arquivo salvo, linha a linha
+        with stage('parse'):
+            canais = parse_m3u(destino)
+        count('channels.parsed', len(canais))
+        print(f"\n📋 {fonte['nome']}: {len(canais)} canais encontrados")
 
         # A fonte iptv-org/br já é filtrada; Ramys precisa filtrar
         if 'iptv-org' not in fonte['url']:
-            canais = filtrar_brasileiros(canais)
+            with stage('filter'):
+                canais = filtrar_brasileiros(canais)
             print(f"   🇧🇷 {len(canais)} canais brasileiros")
 
         todos_canais.extend(canais)
 
     # Deduplicar por URL
     vistos: set[str] = set()
-    unicos: list[dict] = []
+    unicos: list[Channel] = []
     for c in todos_canais:
         if c['url'] not in vistos:
             vistos.add(c['url'])
             unicos.append(c)
     print(f"\n📊 Total único: {len(unicos)} canais de {len(todos_canais)} coletados")
 
+    count('channels.unique', len(unicos))
+
     # Salvar por categoria
-    por_cat = salvar_por_categoria(unicos, pasta_tv)
+    with stage('emit.categories'):
+        por_cat = salvar_por_categoria(unicos, pasta_tv)
 
     # Atualizar channels.json
-    criar_channels_json(unicos, web_dir)
+    with stage('emit.channels_json'):
+        criar_channels_json(unicos, web_dir, pretty)
 
     print("\n" + "=" * 60)
     cats_resumo = {normalize_tv_group(c['group_raw']): 0 for c in unicos}
@@ -258,8 +464,25 @@ def main():
     for cat, qtd in sorted(cats_resumo.items(), key=lambda x: -x[1]):
         print(f"   {cat}: {qtd}")
     print("=" * 60)
+
+    # Só agora: se algo falhar antes, a próxima execução reprocessa as fontes
+    for fonte, (estado, meta, _) in zip(FONTES, resultados):
+        if estado != 'erro':
+            salvar_meta(pasta_tv / fonte['arquivo'], meta)
+
+    emit_summary(Path(__file__).parent)
     print("✅ Concluído! Execute agora: python3 consolidar_data.py")
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Baixa listas IPTV e separa por categorias')
+    parser.add_argument('--forcar', action='store_true',
+                        help='Reprocessa as fontes mesmo sem mudanças')
+    parser.add_argument('--pretty', action='store_true',
+                        help=f'channels.json indentado e sem .gz/.br (debug; ou {PRETTY_ENV}=1)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Roda sob cProfile e grava cache/download_iptv.prof')
+    args = parser.parse_args()
+    with profiled(args.profile, REPORT_PATH.with_name('download_iptv.prof')):
+        main(forcar=args.forcar, pretty=pretty_output(args.pretty))
+    REPORT.save('download_iptv')
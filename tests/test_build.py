@@ -0,0 +1,59 @@
+"""
+Testes do build.py que não dependem da rede (o TMDB é substituído por um dublê).
+
+Uso:
+    python -m pytest -q tests
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import build  # noqa: E402
+from utils import Title, dumps_json  # noqa: E402
+
+RESPOSTAS = {
+    'Com Sinopse': {'tmdb_id': 1, 'overview': 'Uma sinopse', 'year': '2020'},
+    'Sem Sinopse': {'tmdb_id': 2, 'overview': '', 'year': '2021'},
+    'Sem Match':   {},
+    'Falhou':      None,
+}
+
+
+def _catalogo():
+    return {'filmes': [Title(id=build.slugify(t), title=t, poster='', type='movie') for t in RESPOSTAS]}
+
+
+def test_tmdb_so_reconsulta_o_que_ainda_nao_foi_consultado(tmp_path, monkeypatch):
+    consultas = []
+
+    def tmdb_falso(title, media_type='movie'):
+        consultas.append(title)
+        return RESPOSTAS[title]
+
+    monkeypatch.setattr(build, 'fetch_tmdb_metadata', tmdb_falso)
+    monkeypatch.setattr(build, 'TMDB_MAP', {})
+    with contextlib.redirect_stdout(io.StringIO()):
+        output = _catalogo()
+        build.enrich_with_tmdb(output)
+        data_json = tmp_path / 'data.json'
+        data_json.write_text(dumps_json(output), encoding='utf-8')
+
+        # Próximo build: encontrados (com ou sem sinopse) e "não encontrado" são herdados
+        consultas.clear()
+        output = _catalogo()
+        assert build.carry_forward_metadata(output, build.load_previous_catalog(data_json)) == 3
+        build.enrich_with_tmdb(output)
+    assert consultas == ['Falhou']
+    assert [i.get('tmdb_id', 'ausente') for i in output['filmes']] == [1, 2, None, 'ausente']
+
+    # Título mapeado depois no tmdb_map.json: o "não encontrado" antigo não vale mais
+    monkeypatch.setattr(build, 'TMDB_MAP', {'sem match': {'tmdb_id': 99}})
+    with contextlib.redirect_stdout(io.StringIO()):
+        output = _catalogo()
+        build.carry_forward_metadata(output, build.load_previous_catalog(data_json))
+    assert [i['title'] for i in output['filmes'] if build._tmdb_pending(i)] == ['Sem Match', 'Falhou']
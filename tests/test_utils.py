@@ -0,0 +1,61 @@
+"""
+Testes do tokenizer de M3U e dos registros compactos em utils.py.
+
+Uso:
+    python -m pytest -q tests
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import Episode, Title, dumps_json, iter_m3u, parse_extinf  # noqa: E402
+
+
+def test_virgula_dentro_de_atributo_nao_corta_o_titulo():
+    # http-user-agent com vírgula: o tokenizer antigo cortava o título na primeira vírgula
+    info = ('-1 tvg-id="Globo.br" http-user-agent="Mozilla/5.0 (X11; Linux x86_64) '
+            'AppleWebKit/537.36 (KHTML, like Gecko)" group-title="Abertos",Globo SP HD')
+    titulo, attrs = parse_extinf(info)
+    assert titulo == 'Globo SP HD'
+    assert attrs['http-user-agent'] == 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko)'
+    assert attrs['group-title'] == 'Abertos'
+    assert attrs['tvg-id'] == 'Globo.br'
+
+
+def test_titulo_com_virgula_e_atributo_repetido():
+    titulo, attrs = parse_extinf('-1 tvg-name="A" tvg-name="B",Filme, o Retorno')
+    assert titulo == 'Filme, o Retorno'
+    assert attrs == {'tvg-name': 'A'}
+
+
+def test_iter_m3u_pula_comentarios_e_bytes():
+    playlist = io.BytesIO(
+        b'#EXTM3U\n'
+        b'#EXTINF:-1 http-user-agent="a, b" group-title="News",Canal 1\n'
+        b'#EXTVLCOPT:http-referrer=https://x\n'
+        b'\n'
+        b'http://host/1.m3u8\n'
+        b'#EXTINF:-1,Descartado\n'
+        b'#EXTINF:-1,Canal 2\n'
+        b'http://host/2.m3u8\n'
+    )
+    entradas = list(iter_m3u(playlist))
+    assert [(e.title, e.url) for e in entradas] == [('Canal 1', 'http://host/1.m3u8'),
+                                                   ('Canal 2', 'http://host/2.m3u8')]
+    assert entradas[0].attrs['http-user-agent'] == 'a, b'
+
+
+def test_registro_serializa_como_o_dict_equivalente():
+    # Campos ausentes (None incluso é valor) não viram chave; extras vão para o fim
+    data = {'id': 'x', 'title': 'X', 'poster': None, 'type': 'movie', 'nota': 7,
+            'episodes': [{'title': 'Filme', 'url': 'http://a/x.mp4'}]}
+    item = Title.from_dict(data)
+    assert json.loads(dumps_json(item)) == data
+    assert item.to_dict() == {k: v for k, v in item.items()}
+    assert list(item) == item.keys() == ['id', 'title', 'poster', 'episodes', 'type', 'nota']
+    assert len(item) == 6 and item == data and item.episodes[0] == Episode.from_dict(data['episodes'][0])
+    assert not item.overview and item.get('overview', '') == '' and 'overview' not in item
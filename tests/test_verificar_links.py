@@ -0,0 +1,131 @@
+"""
+Testes do verificar_links.py contra um servidor HTTP local (http.server), sem rede.
+
+Uso:
+    python -m pytest -q tests
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import verificar_links  # noqa: E402
+
+TIMEOUT = 0.5
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """/ok → 200 | /sem-head → HEAD 405, GET com Range 206 | /lento → sem resposta | resto → 404"""
+
+    def _responder(self, status, corpo=b''):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        if self.command == 'GET':
+            self.wfile.write(corpo)
+
+    def do_HEAD(self):
+        if self.path == '/ok':
+            self._responder(200)
+        elif self.path == '/sem-head':
+            self._responder(405)
+        elif self.path == '/lento':
+            time.sleep(TIMEOUT * 4)
+            self._responder(200)
+        else:
+            self._responder(404)
+
+    def do_GET(self):
+        if self.path == '/sem-head' and self.headers.get('Range') == 'bytes=0-0':
+            self._responder(206, b'x')
+        else:
+            self.do_HEAD()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def servidor():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+
+
+def test_status_dos_links(servidor):
+    urls = [f'{servidor}/ok', f'{servidor}/sem-head', f'{servidor}/nao-existe', f'{servidor}/lento']
+    res = asyncio.run(verificar_links.verificar_links(urls, concurrency=4, per_host=4, timeout=TIMEOUT))
+
+    assert res[urls[0]]['status'] == 200 and res[urls[0]]['ok']
+    assert res[urls[1]]['status'] == 206 and res[urls[1]]['ok']        # HEAD 405 → GET com Range
+    assert res[urls[2]]['status'] == 404 and not res[urls[2]]['ok']
+    assert res[urls[3]]['status'] == 0 and not res[urls[3]]['ok']
+    assert res[urls[3]]['error'] == 'ReadTimeout'
+
+
+def test_links_validos_so_muda_com_a_lista(tmp_path):
+    path = tmp_path / 'links_validos.txt'
+    links = {'http://a/1': {'ok': True}, 'http://a/2': {'ok': False}}
+    assert verificar_links.salvar_validos(['http://a/1', 'http://a/2'], links, path)
+    assert path.read_text(encoding='utf-8').splitlines()[1:] == ['http://a/1']
+    assert not verificar_links.salvar_validos(['http://a/1', 'http://a/2'], links, path)
+
+
+def _catalogo_do_build(tmp_path):
+    """Filme e série montados pelo build.py, no formato em que chegam ao data.json."""
+    import build
+    from utils import dumps_json
+    m3u = tmp_path / 'm3u'
+    m3u.mkdir()
+    (m3u / 'Filme X.m3u').write_text('#EXTM3U\n#EXTINF:-1,Filme X\nhttp://a/filme.mp4\n', encoding='utf-8')
+    (m3u / 'Serie Y.m3u').write_text('#EXTM3U\n#EXTINF:-1,Ep 1\nhttp://a/s1e1.mp4\n'
+                                     '#EXTINF:-1,Ep 2\nhttp://a/s1e2.mp4\n', encoding='utf-8')
+    filmes, series = [], []
+    build.process_movie(m3u / 'Filme X.m3u', filmes, 'filmes')
+    build.process_single_m3u(m3u / 'Serie Y.m3u', series, 'series', 'series')
+    return json.loads(dumps_json({'schema_version': 2, 'filmes': filmes, 'series': series}))
+
+
+def test_dead_chega_aos_shards_e_ao_indice(tmp_path):
+    from utils import catalog_entry, dumps_json, write_json
+    data = _catalogo_do_build(tmp_path)
+    filme, serie = data['filmes'][0], data['series'][0]
+    assert 'url' not in filme and filme['episodes'][0]['url'] == 'http://a/filme.mp4'
+    for cat, item in (('filmes', filme), ('series', serie)):
+        (tmp_path / 'titles' / cat).mkdir(parents=True)
+        (tmp_path / 'titles' / cat / f"{item['id']}.json").write_text(dumps_json(item), encoding='utf-8')
+    write_json(tmp_path / 'catalog-index.json',
+               {'filmes': [catalog_entry(filme, 'filmes')], 'series': [catalog_entry(serie, 'series')]},
+               compress=False)
+
+    # Filme sem nenhum link ativo: morto também no título; série com um episódio ativo: não
+    links = {'http://a/filme.mp4': {'ok': False}, 'http://a/s1e1.mp4': {'ok': False},
+             'http://a/s1e2.mp4': {'ok': True}}
+    mudancas, titulos = verificar_links.aplicar_status(data, links)
+    assert mudancas > 0 and [c for c, _ in titulos] == ['filmes', 'series']
+    verificar_links.update_catalog_files(tmp_path, titulos)
+
+    shard = json.loads((tmp_path / 'titles' / 'filmes' / f"{filme['id']}.json").read_text(encoding='utf-8'))
+    assert shard['dead'] is True and shard['episodes'][0]['dead'] is True
+    shard = json.loads((tmp_path / 'titles' / 'series' / f"{serie['id']}.json").read_text(encoding='utf-8'))
+    assert shard['seasons'][0]['episodes'][0]['dead'] is True and 'dead' not in shard
+    indice = json.loads((tmp_path / 'catalog-index.json').read_text(encoding='utf-8'))
+    assert indice['filmes'][0]['dead'] is True
+    assert 'dead' not in indice['series'][0]
+
+    # Link de volta: a marcação sai de todos os arquivos
+    mudancas, titulos = verificar_links.aplicar_status(data, {'http://a/filme.mp4': {'ok': True}})
+    verificar_links.update_catalog_files(tmp_path, titulos)
+    shard = json.loads((tmp_path / 'titles' / 'filmes' / f"{filme['id']}.json").read_text(encoding='utf-8'))
+    assert 'dead' not in shard and 'dead' not in shard['episodes'][0]
+    assert 'dead' not in json.loads((tmp_path / 'catalog-index.json').read_text(encoding='utf-8'))['filmes'][0]
@@ -5,6 +5,26 @@ utils.py — Funções utilitárias compartilhadas entre build.py,
 Regra: qualquer lógica usada em mais de um arquivo vive aqui.
 """
 
+import filecmp
+import gzip
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import brotli   # opcional: pip install brotli
+except ImportError:
+    brotli = None
+
 # Mapeamento canônico: group-title M3U (inglês) → categoria PT-BR com emoji.
 # Suporta grupos compostos ("Animation;Kids") — usa apenas a primeira parte.
 _GROUP_MAP = {
@@ -85,3 +105,713 @@ def normalize_tv_group(raw_group: str) -> str:
     if any(c in g for c in '📺🎬📰⚽✝️🧸🎵📚🎥🌿🎨😂🏛️🔬🛍️🍳✈️🚗💅🎞️👨💼🌦️🎭'):
         return g
     return '📺 Geral'
+
+
+# =========================
+# TOKENIZER M3U
+# =========================
+
+# Duração logo após "#EXTINF:" e atributos key="value" seguidos (uma regex cada)
+_EXTINF_DURATION_RE = re.compile(r'\s*-?\d*(?:\.\d+)?')
+_M3U_ATTR_RE        = re.compile(r'\s*([\w-]+)="([^"]*)"')
+
+
+class M3UEntry(NamedTuple):
+    """Uma entrada de playlist: #EXTINF + URL."""
+    title: str | None   # texto após a vírgula (None se a linha não tem título)
+    url:   str
+    attrs: dict         # tvg-id, tvg-logo, group-title, tvg-name, ...
+
+
+def parse_extinf(info: str) -> tuple[str | None, dict]:
+    """Separa título e atributos do que vem depois de '#EXTINF:'.
+
+    - Atributos são lidos em sequência, então vírgulas dentro de valores
+      (ex: http-user-agent) não cortam o título.
+    - Atributo repetido: vale o primeiro.
+    """
+    attrs = {}
+    pos = _EXTINF_DURATION_RE.match(info).end()
+    match = _M3U_ATTR_RE.match(info, pos)
+    while match:
+        attrs.setdefault(match.group(1), match.group(2))
+        pos = match.end()
+        match = _M3U_ATTR_RE.match(info, pos)
+    comma = info.find(',', pos)
+    title = info[comma + 1:].strip() if comma >= 0 else None
+    return title, attrs
+
+
+def iter_m3u(source):
+    """Lê uma playlist M3U linha a linha e gera M3UEntry.
+
+    source: caminho (str/Path) ou qualquer iterável de linhas — arquivo aberto,
+    io.StringIO, resposta em bytes (r.iter_lines()) etc.
+
+    - Linhas em branco e comentários '#' entre o #EXTINF e a URL são ignorados.
+    - Um novo #EXTINF antes da URL substitui o pendente.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'r', encoding='utf-8', errors='ignore') as f:
+            yield from iter_m3u(f)
+        return
+
+    pending = None
+    for line in source:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='ignore')
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#'):
+            if line.startswith('#EXTINF:'):
+                pending = parse_extinf(line[8:])
+            continue
+        if pending is not None:
+            yield M3UEntry(pending[0], line, pending[1])
+            pending = None
+
+
+# =========================
+# REGISTROS COMPACTOS
+# Episódios, temporadas, títulos e canais como dataclasses com __slots__ em vez
+# de dict: sem tabela de chaves repetida por objeto. Os laços quentes do build
+# (M3U, EPG, shards) leem atributos; a interface de dict (get, [], in, del) fica
+# para o código de borda. Viram dict só na serialização (to_dict, gerado por
+# classe). A ordem dos campos é a ordem das chaves no JSON.
+# =========================
+
+class _Unset:
+    """Valor dos campos ausentes (a chave não existe no dict equivalente).
+    É falso, como o get() de uma chave ausente: `item.poster or ''`."""
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return '<ausente>'
+
+    def __reduce__(self):
+        return '_UNSET'     # pickle (pool de processos) devolve o mesmo objeto
+
+
+_UNSET = _Unset()
+
+
+class Record:
+    """Base dos registros: campos em slots, chaves desconhecidas em _extra."""
+    __slots__ = ('_extra',)
+    FIELDS: tuple = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Registro a partir de um dict (ex: data.json lido do disco)."""
+        return data if isinstance(data, cls) else cls._build(data)
+
+    @classmethod
+    def _build(cls, data):
+        if cls._FIELDSET.issuperset(data):
+            return cls(**data)
+        record = cls(**{k: v for k, v in data.items() if k in cls._FIELDSET})
+        record._extra = {k: v for k, v in data.items() if k not in cls._FIELDSET}
+        return record
+
+    def __getitem__(self, key):
+        if key in self._FIELDSET:
+            value = getattr(self, key)
+            if value is _UNSET:
+                raise KeyError(key)
+            return value
+        extra = getattr(self, '_extra', None)
+        if extra is None or key not in extra:
+            raise KeyError(key)
+        return extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._FIELDSET:
+            setattr(self, key, value)
+        else:
+            extra = getattr(self, '_extra', None)
+            if extra is None:
+                extra = self._extra = {}
+            extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._FIELDSET:
+            if getattr(self, key) is _UNSET:
+                raise KeyError(key)
+            setattr(self, key, _UNSET)
+        else:
+            extra = getattr(self, '_extra', None)
+            if extra is None or key not in extra:
+                raise KeyError(key)
+            del extra[key]
+
+    def __contains__(self, key):
+        if key in self._FIELDSET:
+            return getattr(self, key) is not _UNSET
+        extra = getattr(self, '_extra', None)
+        return extra is not None and key in extra
+
+    def get(self, key, default=None):
+        if key in self._FIELDSET:
+            value = getattr(self, key)
+            return default if value is _UNSET else value
+        extra = getattr(self, '_extra', None)
+        return default if extra is None else extra.get(key, default)
+
+    def to_dict(self) -> dict:
+        """dict raso, na ordem dos campos (registros aninhados continuam registros).
+        Cada classe ganha uma versão gerada em _slotted_record, sem laço nem zip."""
+        data = {k: v for k, v in zip(self.FIELDS, self._GET(self)) if v is not _UNSET}
+        extra = getattr(self, '_extra', None)
+        if extra:
+            data.update(extra)
+        return data
+
+    def __iter__(self):
+        for key, value in zip(self.FIELDS, self._GET(self)):
+            if value is not _UNSET:
+                yield key
+        extra = getattr(self, '_extra', None)
+        if extra:
+            yield from extra
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __len__(self):
+        extra = getattr(self, '_extra', None)
+        return sum(v is not _UNSET for v in self._GET(self)) + (len(extra) if extra else 0)
+
+    def copy(self):
+        return self.from_dict(self.to_dict())
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return self._GET(self), getattr(self, '_extra', None)
+
+    def __setstate__(self, state):
+        values, extra = state
+        for key, value in zip(self.FIELDS, values):
+            object.__setattr__(self, key, value)
+        if extra is not None:
+            self._extra = extra
+
+
+def _make_to_dict(field_names):
+    """to_dict sob medida (como o dataclasses gera __init__): um teste por campo.
+    É chamado uma vez por registro no dumps_json, então conta no tempo de serialização."""
+    lines = ['def to_dict(self):', '    data = {}']
+    for name in field_names:
+        lines.append(f'    value = self.{name}')
+        lines.append(f'    if value is not _UNSET: data[{name!r}] = value')
+    lines += ['    extra = getattr(self, "_extra", None)',
+              '    if extra: data.update(extra)',
+              '    return data']
+    namespace = {'_UNSET': _UNSET}
+    exec('\n'.join(lines), namespace)
+    return namespace['to_dict']
+
+
+def _slotted_record(cls):
+    """Dataclass com slots, campos opcionais (padrão _UNSET) e a interface de Record."""
+    getstate, setstate = Record.__getstate__, Record.__setstate__
+    cls = dataclass(slots=True, eq=False, repr=False)(cls)
+    cls.FIELDS = tuple(f.name for f in fields(cls))
+    cls._FIELDSET = frozenset(cls.FIELDS)
+    cls._GET = attrgetter(*cls.FIELDS)
+    cls.to_dict = _make_to_dict(cls.FIELDS)
+    cls.to_dict.__doc__ = Record.to_dict.__doc__
+    cls.__getstate__, cls.__setstate__ = getstate, setstate
+    return cls
+
+
+@_slotted_record
+class Episode(Record):
+    title:       str  = _UNSET
+    url:         str  = _UNSET
+    episode:     int  = _UNSET
+    air_date:    str  = _UNSET
+    overview:    str  = _UNSET
+    still:       str  = _UNSET
+    guest_stars: list = _UNSET
+    locked:      bool = _UNSET
+    release_iso: str  = _UNSET
+    dead:        bool = _UNSET
+
+
+@_slotted_record
+class Season(Record):
+    season:   int  = _UNSET
+    episodes: list = _UNSET
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        season = cls._build(data)
+        if isinstance(season.episodes, list):
+            season.episodes = [Episode.from_dict(ep) for ep in season.episodes]
+        return season
+
+
+@_slotted_record
+class Title(Record):
+    id:           str  = _UNSET
+    title:        str  = _UNSET
+    poster:       str  = _UNSET
+    seasons:      list = _UNSET
+    episodes:     list = _UNSET
+    type:         str  = _UNSET
+    category:     str  = _UNSET
+    local_poster: str  = _UNSET
+    tmdb_poster:  str  = _UNSET
+    posters:      list = _UNSET
+    backdrop:     str  = _UNSET
+    overview:     str  = _UNSET
+    year:         str  = _UNSET
+    genres:       list = _UNSET
+    rating:       float = _UNSET
+    cast:         list = _UNSET
+    tmdb_id:      int  = _UNSET
+    has_schedule: bool = _UNSET
+    dead:         bool = _UNSET
+
+    @classmethod
+    def from_dict(cls, data):
+        """Converte também temporadas e episódios. Em título de temporada única, a lista
+        'episodes' volta a ser a mesma da temporada, como o build gera."""
+        if isinstance(data, cls):
+            return data
+        title = cls._build(data)
+        seasons = title.seasons
+        if isinstance(seasons, list):
+            title.seasons = [Season.from_dict(s) for s in seasons]
+        episodes = title.episodes
+        if isinstance(episodes, list):
+            if (isinstance(seasons, list) and len(seasons) == 1
+                    and episodes == seasons[0].get('episodes')):
+                title.episodes = title.seasons[0].episodes
+            else:
+                title.episodes = [Episode.from_dict(ep) for ep in episodes]
+        return title
+
+
+@_slotted_record
+class Channel(Record):
+    """Canal de TV. tvg_name/group_raw só existem no download (antes de normalizar o grupo)."""
+    id:        str  = _UNSET
+    type:      str  = _UNSET
+    title:     str  = _UNSET
+    tvg_id:    str  = _UNSET
+    tvg_logo:  str  = _UNSET
+    tvg_name:  str  = _UNSET
+    group_raw: str  = _UNSET
+    group:     str  = _UNSET
+    url:       str  = _UNSET
+    episodes:  list = _UNSET
+    dead:      bool = _UNSET
+
+
+def record_to_dict(obj):
+    """default= do json: registros viram dict na hora de serializar (to_dict direto)."""
+    try:
+        return obj.to_dict()
+    except AttributeError:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable") from None
+
+
+# =========================
+# EMISSOR DE ARTEFATOS
+# Todo arquivo gerado passa por aqui: bytes iguais ao arquivo atual → nada é
+# gravado (sem churn no git nem redeploy); senão, temp + rename (atômico).
+# =========================
+
+# (caminho, mudou?) de tudo que foi emitido nesta execução — ver emit_summary()
+_EMITTED: list[tuple[Path, bool]] = []
+
+
+def _record(path: Path, changed: bool, size: int = 0) -> bool:
+    _EMITTED.append((path, changed))
+    if changed:
+        count('artifacts.written')
+        count('bytes_written', size)
+    else:
+        count('artifacts.unchanged')
+    return changed
+
+
+def _replace(tmp: str, path: Path):
+    # mkstemp cria com 0600; o servidor web precisa ler os artefatos
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+
+
+def write_if_changed(path, data) -> bool:
+    """Grava data (str ou bytes) em path só se o conteúdo mudou. Retorna True se gravou."""
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return _record(path, False)
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        _replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return _record(path, True, len(data))
+
+
+@contextmanager
+def atomic_open(path, mode: str = 'w', **kwargs):
+    """open() para escrita em streaming: grava num temp ao lado e, no fim,
+    só substitui o arquivo se o conteúdo mudou (comparação byte a byte)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    os.close(fd)
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+            os.unlink(tmp)
+            _record(path, False)
+        else:
+            size = os.path.getsize(tmp)
+            _replace(tmp, path)
+            _record(path, True, size)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def emitted_changed(path) -> bool:
+    """True se a última emissão de path nesta execução gravou o arquivo."""
+    path = Path(path)
+    for emitted, changed in reversed(_EMITTED):
+        if emitted == path:
+            return changed
+    return True
+
+
+def emit_summary(base_dir=None, limit: int = 20):
+    """Imprime quais artefatos mudaram nesta execução e zera o registro."""
+    changed = [p for p, c in _EMITTED if c]
+    print(f"\n📝 Artefatos: {len(changed)} alterado(s), {len(_EMITTED) - len(changed)} sem mudança")
+    for path in changed[:limit]:
+        try:
+            name = path.resolve().relative_to(Path(base_dir).resolve()) if base_dir else path
+        except ValueError:
+            name = path
+        print(f"   ✏️  {name}")
+    if len(changed) > limit:
+        print(f"   ... e mais {len(changed) - limit}")
+    _EMITTED.clear()
+    return changed
+
+
+# =========================
+# ARTEFATOS DE SAÍDA
+# JSON minificado + irmãos .gz/.br pré-comprimidos (modo padrão);
+# --pretty ou PIRATAFLIX_PRETTY=1 gera JSON indentado, sem compressão (debug).
+# =========================
+
+PRETTY_ENV = 'PIRATAFLIX_PRETTY'
+BROTLI_QUALITY_ENV = 'PIRATAFLIX_BROTLI_QUALITY'
+# Qualidade 5 no data.json: ~0.03s contra ~1.3s da 10, com o .br só ~12% maior
+# (e ainda ~37% menor que o .gz). PIRATAFLIX_BROTLI_QUALITY=10 para o máximo.
+BROTLI_QUALITY = int(os.environ.get(BROTLI_QUALITY_ENV) or 5)
+
+
+def pretty_output(flag: bool = False) -> bool:
+    """True se a saída deve ser indentada (flag --pretty ou variável PIRATAFLIX_PRETTY)."""
+    return flag or os.environ.get(PRETTY_ENV, '') not in ('', '0')
+
+
+def dumps_json(obj, pretty: bool = False) -> str:
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=record_to_dict)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=record_to_dict)
+
+
+def precompress(path, changed: bool = True, quality: int | None = None) -> dict:
+    """Grava <arquivo>.gz (e <arquivo>.br se o brotli estiver instalado) ao lado do arquivo.
+
+    gzip com mtime=0: a mesma entrada sempre gera os mesmos bytes.
+    changed=False (arquivo não mudou) e irmãos já existentes → nada é recomprimido.
+    quality: qualidade do brotli (padrão BROTLI_QUALITY).
+    Retorna os tamanhos {'raw', 'gz', 'br'} ('br' é None sem brotli).
+    """
+    path = Path(path)
+    gz_path = path.with_name(path.name + '.gz')
+    br_path = path.with_name(path.name + '.br') if brotli is not None else None
+    if not changed and gz_path.exists() and (br_path is None or br_path.exists()):
+        _record(gz_path, False)
+        if br_path is not None:
+            _record(br_path, False)
+        return {'raw': path.stat().st_size, 'gz': gz_path.stat().st_size,
+                'br': br_path.stat().st_size if br_path is not None else None}
+    data = path.read_bytes()
+    write_if_changed(gz_path, gzip.compress(data, compresslevel=9, mtime=0))
+    sizes = {'raw': len(data), 'gz': gz_path.stat().st_size, 'br': None}
+    if br_path is not None:
+        write_if_changed(br_path, brotli.compress(data, quality=quality or BROTLI_QUALITY, lgwin=24))
+        sizes['br'] = br_path.stat().st_size
+    return sizes
+
+
+def drop_precompressed(path, exts=('.gz', '.br')):
+    """Remove irmãos .gz/.br antigos (modo --pretty), para não servir conteúdo velho."""
+    path = Path(path)
+    for ext in exts:
+        path.with_name(path.name + ext).unlink(missing_ok=True)
+
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:,.0f} KB"
+
+
+def report_sizes(name: str, sizes: dict, pretty_size: int | None = None):
+    """Imprime a economia de um artefato: indentado → minificado → .gz/.br."""
+    raw = sizes['raw']
+    partes = [_kb(raw)]
+    if pretty_size:
+        partes[0] += f" (indentado {_kb(pretty_size)}, -{100 - raw * 100 // pretty_size}%)"
+    for ext in ('gz', 'br'):
+        if sizes.get(ext) is not None:
+            partes.append(f".{ext} {_kb(sizes[ext])} (-{100 - sizes[ext] * 100 // max(raw, 1)}%)")
+    print(f"   📦 {name}: " + " | ".join(partes))
+
+
+def write_json(path, obj, pretty: bool = False, compress: bool = True,
+               quality: int | None = None) -> dict | None:
+    """Grava JSON de saída. Sem pretty: minificado + .gz/.br, com relatório de tamanho.
+    O tamanho indentado (uma serialização extra) só entra no relatório com --profile.
+    """
+    path = Path(path)
+    changed = write_if_changed(path, dumps_json(obj, pretty))
+    if pretty or not compress:
+        drop_precompressed(path)
+        return None
+    sizes = precompress(path, changed, quality)
+    report_sizes(path.name, sizes, len(dumps_json(obj, True).encode('utf-8')) if REPORT.detailed else None)
+    return sizes
+
+
+# =========================
+# CATÁLOGO FATIADO
+# catalog-index.json (grade/busca) + titles/<categoria>/<id>.json (item completo).
+# O build.py gera tudo; verificar_links.py e build.py --refresh-locks mexem em
+# títulos do data.json e atualizam só os arquivos desses títulos.
+# =========================
+
+CATALOG_INDEX_FIELDS = ('id', 'title', 'poster', 'posters', 'year', 'genres', 'rating', 'type', 'dead')
+# tv.json: lista compacta de canais para a home, tv.html, o app Tizen e a busca
+TV_LIST_FIELDS = ('id', 'title', 'tvg_logo', 'group', 'url', 'dead')
+
+
+def catalog_entry(item, category: str) -> dict:
+    """Entrada do catalog-index.json: o que a grade e a busca mostram, mais as contagens."""
+    entry = {k: item[k] for k in CATALOG_INDEX_FIELDS if item.get(k) not in (None, '', [])}
+    entry['category'] = category
+    if isinstance(item.get('seasons'), list):
+        entry['season_count'] = len(item['seasons'])
+    if isinstance(item.get('episodes'), list):
+        entry['episode_count'] = len(item['episodes'])
+    elif isinstance(item.get('seasons'), list):
+        entry['episode_count'] = sum(len(s.get('episodes') or []) for s in item['seasons'])
+    return entry
+
+
+def tv_entry(canal) -> dict:
+    """Canal do tv.json: só o que a grade e o player usam (a URL do 1º 'episódio' vira 'url')."""
+    entry = {k: canal[k] for k in TV_LIST_FIELDS if canal.get(k) not in (None, '', [])}
+    if 'url' not in entry and canal.get('episodes'):
+        entry['url'] = canal['episodes'][0].get('url', '')
+    return entry
+
+
+def update_catalog_files(web_dir, titles, pretty: bool = False, quality: int | None = None,
+                         tv: list | None = None) -> int:
+    """Regrava o shard e a entrada no catalog-index.json de cada (categoria, item) alterado;
+    com tv (a lista de canais do data.json), também o tv.json.
+
+    Shards e índice que não existem (build anterior ao catálogo fatiado) não são criados.
+    Retorna quantos arquivos foram gravados.
+    """
+    web_dir = Path(web_dir)
+    written = 0
+    if tv is not None and (web_dir / 'tv.json').exists():
+        tv_path = web_dir / 'tv.json'
+        write_json(tv_path, [tv_entry(c) for c in tv], pretty, quality=quality)
+        written += emitted_changed(tv_path)
+    for category, item in titles:
+        shard = web_dir / 'titles' / category / f"{item['id']}.json"
+        if shard.exists():
+            written += write_if_changed(shard, dumps_json(item, pretty))
+
+    index_path = web_dir / 'catalog-index.json'
+    try:
+        index = json.loads(index_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return written
+    posicoes = {}
+    changed = False
+    for category, item in titles:
+        if category not in posicoes:
+            posicoes[category] = {e.get('id'): i for i, e in enumerate(index.get(category, []))}
+        pos = posicoes[category].get(item['id'])
+        entry = catalog_entry(item, category)
+        if pos is not None and index[category][pos] != entry:
+            index[category][pos] = entry
+            changed = True
+    if changed:
+        write_json(index_path, index, pretty, quality=quality)
+        written += 1
+    return written
+
+
+# =========================
+# INSTRUMENTAÇÃO
+# Tempo por etapa + contadores (HTTP, cache, bytes gravados...) de cada script;
+# vai para cache/build_report.json, uma chave por script.
+# =========================
+
+REPORT_PATH = Path(__file__).parent / 'cache' / 'build_report.json'
+
+
+class BuildReport:
+    """Tempos (wall) e contadores de uma execução. Etapas podem se aninhar e repetir:
+    cada uma acumula segundos, chamadas e bytes gravados enquanto estava aberta."""
+
+    def __init__(self):
+        self.lock     = threading.Lock()
+        self.stages   = {}
+        self.counters = Counter()
+        self.started  = time.time()
+        self.detailed = False   # --profile: medidas extras que custam tempo (ex: tamanho indentado)
+
+    @contextmanager
+    def stage(self, name: str):
+        inicio = time.perf_counter()
+        bytes0 = self.counters['bytes_written']
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - inicio
+            with self.lock:
+                st = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0, 'bytes_written': 0})
+                st['seconds']       += elapsed
+                st['calls']         += 1
+                st['bytes_written'] += self.counters['bytes_written'] - bytes0
+
+    def count(self, name: str, n: int = 1):
+        with self.lock:
+            self.counters[name] += n
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {'stages': {k: dict(v) for k, v in self.stages.items()},
+                    'counters': dict(self.counters)}
+
+    def delta(self, since: dict) -> dict:
+        """O que foi registrado depois de snapshot() — para devolver de um processo filho."""
+        now = self.snapshot()
+        stages = {}
+        for name, st in now['stages'].items():
+            old = since['stages'].get(name, {})
+            diff = {k: v - old.get(k, 0) for k, v in st.items()}
+            if diff['calls']:
+                stages[name] = diff
+        counters = {k: v - since['counters'].get(k, 0) for k, v in now['counters'].items()}
+        return {'stages': stages, 'counters': {k: v for k, v in counters.items() if v}}
+
+    def merge(self, delta: dict):
+        with self.lock:
+            for name, diff in delta['stages'].items():
+                st = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0, 'bytes_written': 0})
+                for k, v in diff.items():
+                    st[k] += v
+            self.counters.update(delta['counters'])
+
+    def to_dict(self) -> dict:
+        snap = self.snapshot()
+        return {
+            'started_at':    _iso(self.started),
+            'total_seconds': round(time.time() - self.started, 3),
+            'stages':        {k: {**v, 'seconds': round(v['seconds'], 3)} for k, v in snap['stages'].items()},
+            'counters':      dict(sorted(snap['counters'].items())),
+        }
+
+    def save(self, tool: str, path: Path = REPORT_PATH):
+        """Grava o relatório em path[tool], preservando os dos outros scripts."""
+        path = Path(path)
+        try:
+            report = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            report = {}
+        report[tool] = self.to_dict()
+        write_if_changed(path, json.dumps(report, ensure_ascii=False, indent=2))
+        print(f"⏱️  Relatório de tempos: {path.name} [{tool}]")
+        for name, st in report[tool]['stages'].items():
+            print(f"   {name:<22} {st['seconds']:>8.2f}s  ({st['calls']}x)")
+
+
+def _iso(ts: float) -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(ts))
+
+
+REPORT = BuildReport()
+stage  = REPORT.stage
+count  = REPORT.count
+
+
+@contextmanager
+def profiled(enabled: bool, out_path, top: int = 25):
+    """--profile: roda o bloco sob cProfile, grava out_path (.prof) e imprime o topo."""
+    if not enabled:
+        yield
+        return
+    import cProfile
+    import pstats
+    REPORT.detailed = True
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        REPORT.detailed = False
+        out_path = Path(out_path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(out_path)
+        print(f"\n🔬 Perfil cProfile salvo em {out_path} (top {top} por tempo acumulado):")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
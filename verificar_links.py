@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+verificar_links.py — Verifica os links de filmes/episódios do data.json
+
+- asyncio com limite de conexões por host e total
+- requests.Session por thread (keep-alive), HEAD com fallback para GET com Range
+- cache/link_status.json guarda status, latência e horário de cada link;
+  só links vencidos (TTL) são testados de novo
+- Gera cache/links_validos.txt e marca "dead": true nos episódios fora do ar
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+
+from utils import write_json, write_if_changed, update_catalog_files, pretty_output, PRETTY_ENV
+
+BASE_DIR     = Path(__file__).parent
+DATA_JSON    = BASE_DIR / 'web' / 'data.json'
+STATUS_PATH  = BASE_DIR / 'cache' / 'link_status.json'
+VALIDOS_PATH = BASE_DIR / 'cache' / 'links_validos.txt'
+
+VOD_CATEGORIES = ['filmes', 'series', 'novelas', 'animes', 'infantil']
+
+LINK_TTL_OK_HOURS   = 72    # link ativo: testar de novo após 3 dias
+LINK_TTL_DEAD_HOURS = 12    # link fora do ar: nova chance mais cedo
+LINK_TIMEOUT        = 10
+LINK_CONCURRENCY    = 32
+LINK_PER_HOST       = 4
+STATUS_VERSION      = 1
+
+# Servidores que recusam HEAD respondem com um destes → tentar GET com Range
+HEAD_FALLBACK_STATUS = {400, 403, 405, 406, 501}
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    """Uma Session por thread: reaproveita conexões keep-alive com cada host."""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers['User-Agent'] = 'Mozilla/5.0'
+        _local.session = session
+    return session
+
+
+def probe_link(url: str, timeout: float = LINK_TIMEOUT) -> dict:
+    """Testa um link (HEAD; GET bytes=0-0 se o servidor recusar HEAD)."""
+    session = _session()
+    inicio = time.perf_counter()
+    erro = None
+    try:
+        r = session.head(url, timeout=timeout, allow_redirects=True)
+        status = r.status_code
+        r.close()
+        if status in HEAD_FALLBACK_STATUS:
+            # stream=True: se o servidor ignorar o Range, não baixa o vídeo inteiro
+            r = session.get(url, timeout=timeout, allow_redirects=True, stream=True,
+                            headers={'Range': 'bytes=0-0'})
+            status = r.status_code
+            r.close()
+    except requests.RequestException as e:
+        status = 0
+        erro = type(e).__name__
+    resultado = {
+        'status':     status,
+        'ok':         200 <= status < 400,
+        'latency_ms': round((time.perf_counter() - inicio) * 1000),
+        'checked_at': time.time(),
+    }
+    if erro:
+        resultado['error'] = erro
+    return resultado
+
+
+async def verificar_links(urls, concurrency=LINK_CONCURRENCY, per_host=LINK_PER_HOST,
+                          timeout=LINK_TIMEOUT) -> dict:
+    """Testa as URLs em paralelo e devolve {url: resultado}."""
+    loop = asyncio.get_running_loop()
+    por_host = defaultdict(lambda: asyncio.Semaphore(per_host))
+    total = asyncio.Semaphore(concurrency)
+    resultados = {}
+    feitos = 0
+
+    async def testar(url):
+        nonlocal feitos
+        async with por_host[urlsplit(url).netloc], total:
+            resultados[url] = await loop.run_in_executor(pool, probe_link, url, timeout)
+        feitos += 1
+        if feitos % 500 == 0:
+            print(f"   ⏳ {feitos}/{len(urls)} verificados")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        await asyncio.gather(*(testar(url) for url in urls))
+    return resultados
+
+
+def _title_entries(item: dict):
+    """Dicts com 'url' de um título: o próprio item (filme) e seus episódios."""
+    if item.get('url'):
+        yield item
+    for ep in item.get('episodes') or []:
+        if ep.get('url'):
+            yield ep
+    for season in item.get('seasons') or []:
+        for ep in season.get('episodes') or []:
+            if ep.get('url'):
+                yield ep
+
+
+def _tv_lists(data: dict):
+    for key, canais in data.items():
+        if key.startswith('tv') and isinstance(canais, list):
+            yield canais
+
+
+def iter_link_entries(data: dict, incluir_tv: bool = False):
+    """Todos os dicts com 'url' do catálogo: filmes, episódios e (opcional) canais."""
+    for cat in VOD_CATEGORIES:
+        for item in data.get(cat, []):
+            yield from _title_entries(item)
+    if incluir_tv:
+        for canais in _tv_lists(data):
+            for canal in canais:
+                if canal.get('url'):
+                    yield canal
+
+
+def carregar_status(path: Path = STATUS_PATH) -> dict:
+    try:
+        status = json.loads(path.read_text(encoding='utf-8'))
+        if status.get('version') == STATUS_VERSION:
+            return status.get('links', {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def salvar_status(links: dict, path: Path = STATUS_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'version': STATUS_VERSION, 'links': links}, ensure_ascii=False),
+                    encoding='utf-8')
+
+
+def esta_fresco(info: dict, agora: float, ttl_ok: float, ttl_dead: float) -> bool:
+    ttl = ttl_ok if info.get('ok') else ttl_dead
+    return agora - info.get('checked_at', 0) < ttl * 3600
+
+
+def _url_morta(url: str, links: dict) -> bool:
+    info = links.get(url)
+    return bool(info) and not info['ok']
+
+
+def _set_dead(entry: dict, morto: bool) -> bool:
+    """Marca/desmarca 'dead' numa entrada. Retorna True se mudou."""
+    if morto and not entry.get('dead'):
+        entry['dead'] = True
+        return True
+    if not morto and 'dead' in entry:
+        del entry['dead']
+        return True
+    return False
+
+
+def _marcar(entry: dict, links: dict) -> bool:
+    return _set_dead(entry, _url_morta(entry['url'], links))
+
+
+def _marcar_titulo(item: dict, links: dict) -> int:
+    """Marca os episódios e o próprio título: 'dead' no título quando nenhum link dele
+    funciona (filmes do build só têm URL em episodes[0], nunca no topo)."""
+    episodios = [e for e in _title_entries(item) if e is not item]
+    n = sum(_marcar(ep, links) for ep in episodios)
+    mortos = [bool(ep.get('dead')) for ep in episodios]
+    if item.get('url'):
+        mortos.append(_url_morta(item['url'], links))
+    return n + _set_dead(item, bool(mortos) and all(mortos))
+
+
+def aplicar_status(data: dict, links: dict, incluir_tv: bool = False) -> tuple[int, list]:
+    """Marca/desmarca 'dead' nas entradas do catálogo e nos títulos sem nenhum link ativo.
+    Retorna (quantas entradas mudaram, [(categoria, título) com alguma mudança]).
+    """
+    mudancas = 0
+    titulos = []
+    for cat in VOD_CATEGORIES:
+        for item in data.get(cat, []):
+            n = _marcar_titulo(item, links)
+            if n:
+                mudancas += n
+                titulos.append((cat, item))
+    if incluir_tv:
+        for canais in _tv_lists(data):
+            mudancas += sum(_marcar(canal, links) for canal in canais if canal.get('url'))
+    return mudancas, titulos
+
+
+def salvar_validos(urls, links: dict, path: Path = VALIDOS_PATH) -> bool:
+    """Uma URL ativa por linha, na ordem do catálogo. Sem data no cabeçalho: o arquivo
+    só muda (e só é regravado) quando a lista muda. Retorna True se gravou."""
+    ativos = ''.join(url + '\n' for url in urls if links.get(url, {}).get('ok'))
+    return write_if_changed(path, '# Links ativos (verificar_links.py)\n' + ativos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verifica links do catálogo (data.json)')
+    parser.add_argument('--data', type=Path, default=DATA_JSON, help='Caminho do data.json')
+    parser.add_argument('--tv', action='store_true', help='Inclui os canais de TV')
+    parser.add_argument('--forcar', action='store_true', help='Ignora o cache e testa tudo')
+    parser.add_argument('--ttl-ok', type=float, default=LINK_TTL_OK_HOURS,
+                        help='Horas até testar de novo um link ativo')
+    parser.add_argument('--ttl-dead', type=float, default=LINK_TTL_DEAD_HOURS,
+                        help='Horas até testar de novo um link fora do ar')
+    parser.add_argument('--concorrencia', type=int, default=LINK_CONCURRENCY,
+                        help='Conexões simultâneas no total')
+    parser.add_argument('--por-host', type=int, default=LINK_PER_HOST,
+                        help='Conexões simultâneas por host')
+    parser.add_argument('--timeout', type=float, default=LINK_TIMEOUT)
+    parser.add_argument('--pretty', action='store_true',
+                        help=f'data.json indentado e sem .gz/.br (debug; ou {PRETTY_ENV}=1)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🔗 VERIFICAÇÃO DE LINKS")
+    print("=" * 60)
+
+    if not args.data.exists():
+        print(f"❌ {args.data} não encontrado. Execute antes: python3 build.py")
+        return
+    data = json.loads(args.data.read_text(encoding='utf-8'))
+
+    # URLs únicas, na ordem do catálogo
+    urls = list(dict.fromkeys(e['url'] for e in iter_link_entries(data, args.tv)))
+    links = {} if args.forcar else carregar_status()
+    links = {url: links[url] for url in urls if url in links}   # descarta links que saíram do catálogo
+
+    agora = time.time()
+    pendentes = [u for u in urls if u not in links or not esta_fresco(links[u], agora, args.ttl_ok, args.ttl_dead)]
+    print(f"📋 {len(urls)} links no catálogo — {len(urls) - len(pendentes)} em cache, {len(pendentes)} para testar")
+
+    if pendentes:
+        inicio = time.perf_counter()
+        # Agrupar por host ajuda o keep-alive de cada thread
+        pendentes.sort(key=lambda u: urlsplit(u).netloc)
+        links.update(asyncio.run(verificar_links(pendentes, args.concorrencia, args.por_host, args.timeout)))
+        print(f"   ⏱️ {len(pendentes)} links em {time.perf_counter() - inicio:.1f}s")
+    salvar_status(links)
+
+    validos = sum(1 for u in urls if links[u]['ok'])
+    print(f"   ✅ Ativos: {validos}")
+    print(f"   ❌ Fora do ar: {len(urls) - validos}")
+
+    if salvar_validos(urls, links):
+        print(f"💾 {VALIDOS_PATH.relative_to(BASE_DIR)} atualizado")
+    else:
+        print(f"✅ {VALIDOS_PATH.relative_to(BASE_DIR)} sem mudanças")
+
+    mudancas, titulos = aplicar_status(data, links, args.tv)
+    if mudancas:
+        pretty = pretty_output(args.pretty)
+        write_json(args.data, data, pretty)
+        # Páginas de categoria carregam o índice e os shards, não o data.json
+        update_catalog_files(args.data.parent, titulos, pretty, tv=data.get('tv') if args.tv else None)
+        print(f"💾 {args.data.name}: {mudancas} marcações 'dead' alteradas em {len(titulos)} título(s)")
+    else:
+        print(f"✅ {args.data.name} sem mudanças")
+
+
+if __name__ == '__main__':
+    main()
@@ -36,18 +36,27 @@
 
     // ─── INIT ────────────────────────────────────────────────────────────────
 
+    // Tenta as URLs em ordem: arquivos leves do catálogo fatiado, depois os antigos
+    function ajaxFirst(urls, callback) {
+        ajax(urls[0], function(err, data) {
+            if ((err || !data) && urls.length > 1) return ajaxFirst(urls.slice(1), callback);
+            callback(err, data);
+        });
+    }
+
     function init() {
-        ajax('data.json', function(err, data) {
+        // catalog-index.json: só o que os cards mostram; detalhes vêm de titles/ ao abrir (shared.js)
+        ajaxFirst(['catalog-index.json', 'data.json'], function(err, data) {
             if (err || !data) {
                 var loading = document.querySelector('.loading');
                 if (loading) loading.textContent = 'Erro ao carregar catálogo.';
-                console.error('❌ Erro ao carregar data.json:', err);
+                console.error('❌ Erro ao carregar catálogo:', err);
                 return;
             }
 
             window.vodData = data;
 
-            ajax('channels.json', function(err2, chs) {
+            ajaxFirst(['tv.json', 'channels.json'], function(err2, chs) {
                 var channels = (err2 || !chs) ? [] : chs;
 
                 // tv-player.js lê window.vodData.tv (lista plana de canais)
@@ -109,7 +118,8 @@
 
     function makeCard(item, cat) {
         var card = document.createElement('div');
-        card.className = 'item-card';
+        card.className = item.dead ? 'item-card is-dead' : 'item-card';
+        if (item.dead) card.title = 'Link fora do ar';
 
         // shared.js -> initPosterRotation() lê este atributo pra alternar capas
         if (item.posters && item.posters.length > 1) {
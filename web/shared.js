@@ -108,7 +108,14 @@ function playEpisode(url, title, itemId, category, episodeIndex) {
         if (typeof window.openTVPlayer === 'function') {
             const go = () => window.openTVPlayer(itemId);
             if (!window.vodData || !window.vodData[category]) {
-                fetch('data.json').then(r => r.json()).then(d => { window.vodData = d; go(); });
+                const load = category === 'tv'
+                    ? loadTvChannels().then(tv => {
+                        // Páginas do índice/shards podem nunca ter criado window.vodData
+                        window.vodData = window.vodData || {};
+                        window.vodData.tv = tv;
+                    })
+                    : fetch('data.json').then(r => r.json()).then(d => { window.vodData = d; });
+                load.then(go);
             } else { go(); }
         } else { window.open(url, '_blank'); }
         closeAllModals(); return;
@@ -120,6 +127,13 @@ function playEpisode(url, title, itemId, category, episodeIndex) {
 }
 
 function playFirstEpisode(category, itemId) {
+    if (isTvCategory(category)) { _playFirstEpisode(category, itemId); return; }
+    loadTitleDetails(category, itemId)
+        .then(() => _playFirstEpisode(category, itemId))
+        .catch(err => console.error('❌ Erro ao carregar título:', err));
+}
+
+function _playFirstEpisode(category, itemId) {
     const items = window.vodData[category];
     if (!items) return;
     
@@ -161,6 +175,46 @@ function playFirstEpisode(category, itemId) {
     }
 }
 
+// =====================
+// CATÁLOGO FATIADO
+// catalog-index.json (grade/busca) + titles/<categoria>/<id>.json (detalhes sob demanda)
+// =====================
+const _titleRequests = {};
+
+function loadCatalogIndex() {
+    return fetch('catalog-index.json')
+        .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
+        .catch(() => fetch('data.json').then(r => r.json()));   // build sem índice: catálogo completo
+}
+
+// tv.json: lista compacta de canais (título, logo, grupo, url); build sem ela → data.json.
+// Uma requisição por página: grade, channelsDict e busca usam a mesma lista.
+let _tvChannels = null;
+
+function loadTvChannels() {
+    if (!_tvChannels) {
+        _tvChannels = fetch('tv.json')
+            .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
+            .catch(() => fetch('data.json').then(r => r.json()).then(d => d.tv || []))
+            .catch(() => []);
+    }
+    return _tvChannels;
+}
+
+// Completa o item de window.vodData com temporadas, episódios, elenco e schedule
+function loadTitleDetails(category, itemId) {
+    const item = (window.vodData[category] || []).find(i => i.id === itemId);
+    if (!item || Array.isArray(item.episodes) || Array.isArray(item.seasons)) return Promise.resolve(item);
+    const key = category + '/' + itemId;
+    if (!_titleRequests[key]) {
+        _titleRequests[key] = fetch('titles/' + category + '/' + encodeURIComponent(itemId) + '.json')
+            .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
+            .then(full => Object.assign(item, full))
+            .catch(err => { delete _titleRequests[key]; throw err; });
+    }
+    return _titleRequests[key];
+}
+
 // =====================
 // ALTERNÂNCIA DE CAPAS
 // =====================
@@ -221,7 +275,10 @@ function getAllTvChannels() {
 // =====================
 function openModal(category, itemId) {
     history.pushState({ pirataflixModal: true, category, itemId }, '');
-    _renderModal(category, itemId);
+    if (isTvCategory(category)) { _renderModal(category, itemId); return; }
+    loadTitleDetails(category, itemId)
+        .then(() => _renderModal(category, itemId))
+        .catch(err => console.error('❌ Erro ao carregar título:', err));
 }
 
 function _renderModal(category, itemId) {
@@ -509,8 +566,22 @@ function doSearch(query) {
         animes: '👻', infantil: '🧸'
     };
     
-    // Adicionar categorias de TV
-    window.TV_CATEGORIES.forEach(cat => {
+    // Adicionar categorias de TV: tv_* (data.json consolidado) ou a lista 'tv'.
+    // Páginas que só carregaram o catalog-index.json buscam o tv.json na primeira busca.
+    window.vodData = window.vodData || {};
+    const tvCats = window.TV_CATEGORIES.filter(cat => window.vodData[cat]);
+    if (!tvCats.length) {
+        if (!window.vodData.tv) {
+            window.vodData.tv = [];
+            loadTvChannels().then(tv => {
+                window.vodData.tv = tv;
+                const input = document.getElementById('searchInput');
+                if (input && input.value.trim().length >= 2) doSearch(input.value.trim());
+            });
+        }
+        tvCats.push('tv');
+    }
+    tvCats.forEach(cat => {
         cats[cat] = '📡';
     });
     
@@ -577,8 +648,7 @@ function initHamburger() {
 // CHANNELS
 // =====================
 function loadChannels() {
-    return fetch('channels.json')
-        .then(r => r.json())
+    return loadTvChannels()
         .then(data => {
             window.channelsDict = {};
             data.forEach(c => {
@@ -678,6 +748,9 @@ window.playFirstEpisode    = playFirstEpisode;
 window.openModal           = openModal;
 window.openSearch          = openSearch;
 window.loadChannels        = loadChannels;
+window.loadCatalogIndex    = loadCatalogIndex;
+window.loadTvChannels      = loadTvChannels;
+window.loadTitleDetails    = loadTitleDetails;
 window.setupModalListeners = setupModalListeners;
 window.closeAllModals      = closeAllModals;
 window.initPosterRotation  = initPosterRotation;
@@ -3,7 +3,7 @@ const ASSETS = [
   './', './index.html', './filmes.html', './series.html', './novelas.html',
   './animes.html', './infantil.html', './tv.html',
   './style.css', './tv-player.css', './shared.js', './tv-player.js',
-  './novo-player.js', './data.json', './channels.json',
+  './novo-player.js', './data.json', './catalog-index.json', './tv.json', './channels.json',
   './favicon.png', './manifest.json'
 ];
 self.addEventListener('install', e => {
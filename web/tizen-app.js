@@ -63,15 +63,42 @@
 
   // ─── INIT ────────────────────────────────────────────────────────────────
 
+  // Tenta as URLs em ordem: arquivos leves do catálogo fatiado, depois os antigos
+  function ajaxFirst(urls, callback) {
+    ajax(urls[0], function (err, data) {
+      if ((err || !data) && urls.length > 1) return ajaxFirst(urls.slice(1), callback);
+      callback(err, data);
+    });
+  }
+
+  // catalog-index.json só tem o que os cards mostram: temporadas, episódios e a URL
+  // do filme vêm de titles/<cat>/<id>.json na primeira vez que o título é aberto
+  function withDetails(cat, itemId, callback) {
+    var items = vodData[cat] || [];
+    var item  = null;
+    for (var i = 0; i < items.length; i++) {
+      if (items[i].id === itemId || items[i].title === itemId) { item = items[i]; break; }
+    }
+    if (!item || !item.id || item.url || item.episodes || item.seasons) { callback(item); return; }
+    ajax('titles/' + cat + '/' + encodeURIComponent(item.id) + '.json', function (err, full) {
+      if (!err && full) {
+        for (var k in full) {
+          if (full.hasOwnProperty(k)) item[k] = full[k];
+        }
+      }
+      callback(item);
+    });
+  }
+
   function init() {
-    ajax('data.json', function (err, data) {
+    ajaxFirst(['catalog-index.json', 'data.json'], function (err, data) {
       if (err || !data) {
         document.getElementById('loading').textContent = 'Erro ao carregar catálogo.';
         return;
       }
       vodData = data;
 
-      ajax('channels.json', function (err2, chs) {
+      ajaxFirst(['tv.json', 'channels.json'], function (err2, chs) {
         channels = (err2 || !chs) ? [] : chs;
         // injeta canais no vodData para compatibilidade
         vodData['tv'] = channels;
@@ -208,12 +235,10 @@
   }
 
   function resumeCw(entry) {
-    var items = vodData[entry.category] || [];
-    var item  = null;
-    for (var i = 0; i < items.length; i++) {
-      if (items[i].id === entry.itemId || items[i].title === entry.itemId) { item = items[i]; break; }
-    }
+    withDetails(entry.category, entry.itemId, function (item) { resumeCwItem(entry, item); });
+  }
 
+  function resumeCwItem(entry, item) {
     if (!item) { playVideo(entry.url, entry.title, entry.itemId, entry.category, 0); return; }
 
     var epList = getEpList(item);
@@ -270,7 +295,7 @@
 
   function makeCard(item, cat) {
     var card = document.createElement('div');
-    card.className = 'card';
+    card.className = item.dead ? 'card is-dead' : 'card';
     card.setAttribute('tabindex', '0');
 
     var poster = getPoster(item, cat);
@@ -296,7 +321,7 @@
 
   function makeTvCard(canal, idx) {
     var card = document.createElement('div');
-    card.className = 'card card-tv';
+    card.className = canal.dead ? 'card card-tv is-dead' : 'card card-tv';
     card.setAttribute('tabindex', '0');
 
     var logo = (canal.tvg_logo && canal.tvg_logo.indexOf('http') === 0) ? canal.tvg_logo : TV_POSTER;
@@ -318,13 +343,12 @@
   // ─── MODAL ───────────────────────────────────────────────────────────────
 
   function openModal(cat, itemId) {
-    var items = vodData[cat] || [];
-    var item = null;
-    for (var i = 0; i < items.length; i++) {
-      if (items[i].id === itemId || items[i].title === itemId) { item = items[i]; break; }
-    }
-    if (!item) return;
+    withDetails(cat, itemId, function (item) {
+      if (item) renderModal(cat, itemId, item);
+    });
+  }
 
+  function renderModal(cat, itemId, item) {
     var modal    = document.getElementById('modal');
     var backdrop = document.getElementById('modal-backdrop');
     var body     = document.getElementById('modal-body');
@@ -579,12 +603,12 @@
   // ─── PLAY ─────────────────────────────────────────────────────────────────
 
   function playFirstEpisode(cat, itemId) {
-    var items = vodData[cat] || [];
-    var item  = null;
-    for (var i = 0; i < items.length; i++) {
-      if (items[i].id === itemId || items[i].title === itemId) { item = items[i]; break; }
-    }
-    if (!item) return;
+    withDetails(cat, itemId, function (item) {
+      if (item) playFirstEpisodeOf(cat, itemId, item);
+    });
+  }
+
+  function playFirstEpisodeOf(cat, itemId, item) {
 
     var epList = getEpList(item);
     if (epList.length) {